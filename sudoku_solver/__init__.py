@@ -0,0 +1,9 @@
+from .solver import SudokuSolver, SolveResult, InvalidSudokuError, SolutionCount, Step, SolverStats, TechniqueStats
+from .encoding import field_to_string, field_from_string
+from .batch import solve_many, aggregate_stats, BatchResult
+from .puzzle_file import read_puzzles, write_results
+from .vectorized import solve_array
+from .cache import SolutionCache, canonical_form
+from .generator import generate, generate_many, grade, GeneratedPuzzle
+from .service import AsyncSolver, ServiceOverloadedError, serve_http
+from .corpus import Corpus, write_corpus, solve_corpus
@@ -0,0 +1,162 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .encoding import field_to_string
+from .solver import SudokuSolver, SolveResult, SolverStats
+
+
+class BatchResult:
+
+    __slots__ = ("index","puzzle","status","grid","error","stats")
+
+    ERROR = "error"
+
+    def __init__(self, index, puzzle, status, grid, error = None, stats = None):
+        self.index = index
+        self.puzzle = puzzle
+        self.status = status
+        self.grid = grid
+        self.error = error
+        self.stats = stats
+
+    @property
+    def solved(self):
+        return self.status == SolveResult.SOLVED
+
+    @property
+    def solution(self):
+        return self.grid if self.solved else None
+
+    def __repr__(self):
+        return "BatchResult(index={}, status={!r}, grid={!r}, error={!r})".format(self.index,self.status,self.grid,self.error)
+
+
+#chunks waiting in the pool or for their turn in the output, per worker
+PENDING_CHUNKS_PER_WORKER = 4
+
+
+#puzzles are nested lists or strings in the format of encoding.py, results are yielded as BatchResult
+#workers=0 solves in the calling process; time_limit is in seconds per puzzle
+#with collect_stats every result carries the SolverStats of its puzzle, see aggregate_stats()
+#techniques are passed on to SudokuSolver.solve()
+def solve_many(puzzles, workers = None, chunksize = 64, ordered = True, engine = None,
+               max_rounds = None, max_technique_calls = None, time_limit = None, collect_stats = False, techniques = None):
+    options = (engine,max_rounds,max_technique_calls,time_limit,collect_stats,techniques)
+    chunks = _chunk_puzzles(puzzles,chunksize)
+    if workers == 0:
+        for start, chunk in chunks:
+            yield from _to_results(start,chunk,_solve_chunk(chunk,options))
+    else:
+        yield from _solve_in_pool(chunks,workers or os.cpu_count(),ordered,options)
+
+#a puzzle that can't be written as a string is passed on as it is, so converting it fails again in the worker
+#and only its result is an error
+def _chunk_puzzles(puzzles, chunksize):
+    chunk = []
+    start = 0
+    for puzzle in puzzles:
+        if not isinstance(puzzle,str):
+            try:
+                puzzle = field_to_string(puzzle)
+            except (ValueError,TypeError):
+                pass
+        chunk.append(puzzle)
+        if len(chunk) == chunksize:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+def _to_results(start, chunk, outcomes):
+    for offset, (status, grid, error, stats) in enumerate(outcomes):
+        yield BatchResult(start+offset,chunk[offset],status,grid,error,None if stats is None else SolverStats.from_dict(stats))
+
+#adds up the stats of the results that have them
+def aggregate_stats(results):
+    total = SolverStats()
+    for result in results:
+        if result.stats is not None:
+            total.merge(result.stats)
+    return total
+
+def _solve_in_pool(chunks, workers, ordered, options):
+    max_pending = workers*PENDING_CHUNKS_PER_WORKER
+    executor = ProcessPoolExecutor(workers)
+    pending = {}
+    finished = {}
+    next_start = 0
+    chunks_left = True
+    try:
+        while True:
+            while chunks_left and len(pending)+len(finished) < max_pending:
+                chunk = next(chunks,None)
+                if chunk is None:
+                    chunks_left = False
+                    break
+                start, puzzles = chunk
+                pending[executor.submit(_solve_chunk,puzzles,options)] = (start,puzzles,executor)
+            if not pending:
+                break
+            done, _ = wait(pending,return_when=FIRST_COMPLETED)
+            for future in done:
+                start, puzzles, used_executor = pending.pop(future)
+                try:
+                    outcomes = future.result()
+                except BrokenProcessPool:
+                    if used_executor is executor:
+                        executor.shutdown(wait=False)
+                        executor = ProcessPoolExecutor(workers)
+                    outcomes = _solve_isolated(puzzles,options)
+                except Exception as error:
+                    outcomes = [(BatchResult.ERROR,None,_describe(error),None)]*len(puzzles)
+                if not ordered:
+                    yield from _to_results(start,puzzles,outcomes)
+                    continue
+                finished[start] = (puzzles,outcomes)
+                while next_start in finished:
+                    puzzles, outcomes = finished.pop(next_start)
+                    yield from _to_results(next_start,puzzles,outcomes)
+                    next_start += len(puzzles)
+    finally:
+        executor.shutdown(wait=False,cancel_futures=True)
+
+#a chunk that was in a pool when one of its workers died is solved again one puzzle at a time
+#in a separate process, so the puzzle that kills its worker is the only one reported as failed
+def _solve_isolated(puzzles, options):
+    outcomes = []
+    executor = ProcessPoolExecutor(1)
+    try:
+        for puzzle in puzzles:
+            try:
+                outcomes.extend(executor.submit(_solve_chunk,[puzzle],options).result())
+            except BrokenProcessPool:
+                outcomes.append((BatchResult.ERROR,None,"The worker process died",None))
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(1)
+    finally:
+        executor.shutdown(wait=False)
+    return outcomes
+
+#runs in the worker processes, so it only takes and returns strings and tuples
+def _solve_chunk(puzzles, options):
+    engine, max_rounds, max_technique_calls, time_limit, collect_stats, techniques = options
+    outcomes = []
+    for puzzle in puzzles:
+        try:
+            if not isinstance(puzzle,str):
+                puzzle = field_to_string(puzzle)
+            if engine is None:
+                solver = SudokuSolver.from_string(puzzle,collect_stats=collect_stats)
+            else:
+                solver = SudokuSolver.from_string(puzzle,engine,collect_stats=collect_stats)
+            result = solver.solve(max_rounds,max_technique_calls,time_limit,techniques=techniques)
+            stats = None if solver.stats is None else solver.stats.to_dict()
+            outcomes.append((result.status,field_to_string(result.field),None,stats))
+        except Exception as error:
+            outcomes.append((BatchResult.ERROR,None,_describe(error),None))
+    return outcomes
+
+def _describe(error):
+    return "{}: {}".format(type(error).__name__,error)
@@ -0,0 +1,137 @@
+import json
+import platform
+import time
+import tracemalloc
+
+from .benchmark_corpora import CORPORA
+from . import generator
+from .solver import SudokuSolver
+
+#relative change of a metric that counts as a regression
+DEFAULT_THRESHOLD = 0.1
+#for every other metric lower is better
+HIGHER_IS_BETTER = ("puzzles_per_second",)
+COMPARED_METRICS = ("puzzles_per_second","p50_ms","p95_ms","p99_ms","peak_memory_kb","rounds_per_puzzle")
+
+
+#solves every puzzle of the chosen corpora once to warm up and then `repeat` times, reporting per corpus:
+#puzzles per second, latency percentiles, rounds per puzzle and the peak memory of a single solve
+#with generate, that many sudokus are also generated in this process, seeds 0, 1, ..., as the "generator" entry
+def run_benchmark(corpora = None, engine = None, repeat = 3, generate = 0):
+    report = {"engine":engine or SudokuSolver.ENGINES[0],"python":platform.python_version(),"repeat":repeat,"corpora":{}}
+    for name in corpora or CORPORA:
+        report["corpora"][name] = _measure_corpus(CORPORA[name],engine,repeat)
+    if generate:
+        report["generator"] = _measure_generator(generate)
+    return report
+
+def _measure_corpus(puzzles, engine, repeat):
+    for puzzle in puzzles:
+        _make_solver(puzzle,engine).solve()
+    latencies = []
+    rounds = 0
+    for i in range(repeat):
+        for puzzle in puzzles:
+            start = time.perf_counter()
+            result = _make_solver(puzzle,engine).solve()
+            latencies.append(time.perf_counter()-start)
+            if not result.solved:
+                raise RuntimeError("Benchmark puzzle not solved: {}".format(result.status))
+            rounds += result.rounds
+    latencies.sort()
+    return {"puzzles":len(puzzles),
+            "puzzles_per_second":len(latencies)/sum(latencies),
+            "p50_ms":_percentile(latencies,50)*1000,
+            "p95_ms":_percentile(latencies,95)*1000,
+            "p99_ms":_percentile(latencies,99)*1000,
+            "rounds_per_puzzle":rounds/len(latencies),
+            "peak_memory_kb":_peak_memory(puzzles,engine)/1024}
+
+#measured in a separate pass, tracing allocations slows the solver down too much for the timings
+def _peak_memory(puzzles, engine):
+    peak = 0
+    tracemalloc.start()
+    try:
+        for puzzle in puzzles:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            _make_solver(puzzle,engine).solve()
+            peak = max(peak,tracemalloc.get_traced_memory()[1]-base)
+    finally:
+        tracemalloc.stop()
+    return peak
+
+#one core, as the workers of generate_many don't share anything
+def _measure_generator(count):
+    latencies = []
+    difficulties = {}
+    for seed in range(count):
+        start = time.perf_counter()
+        puzzle = generator.generate(seed=seed)
+        latencies.append(time.perf_counter()-start)
+        difficulties[puzzle.difficulty] = difficulties.get(puzzle.difficulty,0)+1
+    latencies.sort()
+    return {"puzzles":count,
+            "puzzles_per_second":len(latencies)/sum(latencies),
+            "p50_ms":_percentile(latencies,50)*1000,
+            "p95_ms":_percentile(latencies,95)*1000,
+            "p99_ms":_percentile(latencies,99)*1000,
+            "difficulties":difficulties}
+
+def _make_solver(puzzle, engine):
+    return SudokuSolver.from_string(puzzle) if engine is None else SudokuSolver.from_string(puzzle,engine)
+
+#nearest rank on sorted values
+def _percentile(sorted_values, percent):
+    rank = max(1,-(-len(sorted_values)*percent // 100))
+    return sorted_values[rank-1]
+
+#lists the metrics of the corpora in both reports that got worse by more than the threshold
+#raises ValueError when the reports are of different engines, which aren't comparable
+def find_regressions(baseline, report, threshold = DEFAULT_THRESHOLD):
+    if baseline["engine"] != report["engine"]:
+        raise ValueError("The baseline is of the {} engine, the report of the {} engine".format(baseline["engine"],report["engine"]))
+    regressions = []
+    for name, metrics in _entries(report).items():
+        if name not in _entries(baseline):
+            continue
+        for metric in COMPARED_METRICS:
+            old = _entries(baseline)[name].get(metric)
+            new = metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new-old)/old
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > threshold:
+                regressions.append("{} {}: {:.4g} -> {:.4g} ({:+.1%})".format(name,metric,old,new,(new-old)/old))
+    return regressions
+
+#the corpora and the generator, by name
+def _entries(report):
+    entries = dict(report["corpora"])
+    if "generator" in report:
+        entries["generator"] = report["generator"]
+    return entries
+
+def save_report(report, path):
+    with open(path,"w") as file:
+        json.dump(report,file,indent=2,sort_keys=True)
+
+def load_report(path):
+    with open(path) as file:
+        return json.load(file)
+
+def format_report(report):
+    lines = ["engine {}, python {}, {} runs".format(report["engine"],report["python"],report["repeat"]),
+             "{:<10}{:>8}{:>12}{:>10}{:>10}{:>10}{:>10}{:>12}".format("corpus","puzzles","puzzles/s","p50 ms","p95 ms","p99 ms","rounds","peak KiB")]
+    for name, metrics in report["corpora"].items():
+        lines.append("{:<10}{:>8}{:>12.1f}{:>10.2f}{:>10.2f}{:>10.2f}{:>10.1f}{:>12.1f}".format(
+            name,metrics["puzzles"],metrics["puzzles_per_second"],metrics["p50_ms"],metrics["p95_ms"],
+            metrics["p99_ms"],metrics["rounds_per_puzzle"],metrics["peak_memory_kb"]))
+    if "generator" in report:
+        metrics = report["generator"]
+        lines.append("{:<10}{:>8}{:>12.1f}{:>10.2f}{:>10.2f}{:>10.2f}  {}".format(
+            "generator",metrics["puzzles"],metrics["puzzles_per_second"],metrics["p50_ms"],metrics["p95_ms"],metrics["p99_ms"],
+            ", ".join("{} {}".format(count,name) for name, count in sorted(metrics["difficulties"].items()))))
+    return "\n".join(lines)
@@ -0,0 +1,194 @@
+#puzzles bundled for the benchmark, one 81 character string each with "." for empty cells
+#every puzzle has a single solution
+
+#solved by naked and hidden singles alone
+EASY = (
+    ".97....635.4...1......7.254..31.5...7...2..382..7.941..5..9..72..8...9...4261.385",
+    "6..4.....9.5816..4.4.........2.5......4..1.3.1.6.3.578.1..7..4.36.1.285..2938.167",
+    "1....9.545..23....7.2.8...9.8.....97.9132.4.....4..612425.139689.........7.9.6..1",
+    "8.6......74..8.2......2..766..5....34.3...9..1..23.6.7..7.963.2.....2.......53.9.",
+    "..2.13........8.3.7..4..9.....7..54.....9..7.....65.839.81......1...27982..3.9.5.",
+    "97.38.6423.....87.2..9..35..9.8.52.....1.3..7.1.........953....5...2.16...8..45..",
+    "..41....26...48..3...3.61.....9.....72.634........57.9..5...2....65..91.1.826.3..",
+    ".13.846.7...3..2844.....1...7.53.9..6.5......13..4..7.7..89....5.9..7..2...1..79.",
+    "....3.4...9.651.28..8.....9.34.8..95.59.4.1.6.16..5.4...2.73.....591.83.14..6...2",
+    "...46.27.......1.8.86.13..5371..2....2..8.7..8.5.........874.31...5..6..9...2..4.",
+    ".2...49.8..871.5.6..3..6.27....7.3..26..437.94.7..8........92........8.5.7.4651..",
+    "32....76187.....45.1...782.54.2.6.3...28.1596...37...49........1....3..8..3.1..7.",
+    ".9...3.5..3..9786...84...1.2.1.....98...7952.....3....4..3....1.19..6.8...5.....2",
+    "8.41......1.6...94..943817...6...7..19...6.43.4...3.685..3..68..67....19.8.....2.",
+    ".4.68..3.2..43.....1829.7.66..7..92......9.67...563.14.37...25.9..1.8.....5..2..9",
+    "...6.5...9.283....6...92....9........85317..6.3.5.9.2.5...48172....536.....7.1..4",
+    "6..31.9742..8..3.........25..2.9.6.3..3.2.19...9..3...9......87358....6..1468....",
+    ".38.....512.96..4....1..6..7.1.3.2.85...1937..4..825.....4.1...............8..7.2",
+    "..4..2.9.7.8..9.12..1...4.3...98.26...6..5...4....3.7.8....67..6..3..8..12.....46",
+    ".4......6.13.7..2.96.5.8..1395.84..2.....3.94..4..1..3.7..124.52.86.........95.6.",
+    "...2...397..4.35..9...6.....2.14.9..85.37...4..685.....39......6.4..137527......1",
+    "7.....645..82.4.1.1......2....915...5.3..87962......5.....37..2826..13.94..6...81",
+    "1.6.5.3.........18.3....76.74.5.....358....2..1.8.9.74.6.9..2538...1..475..3..681",
+    "....941.23......964.9......2...7..15.....6....9.58..6..3...9..79.27.168..46..895.",
+    ".571...46..38.2..1..265..38.8..2..14..4....2..7....38....5....3.9.7.3.......984..",
+    "12.7.369.573...1.46..5...87....3..19.....8.3..16....7.7...8.9.1..426..58...9..263",
+    "......2....24.....5918..3.78..71642..479....5.....4.73.8...57....4..1...7.3...9.2",
+    "..8.12.67........42653........69.....9.7.481.4.71.5..67..2.1.89....73..2....893..",
+    "...8...312...5....1.9...6..7.2.8.91..1.7924.6698.4......456.1.7....2...5......869",
+    ".8.52.46.4.28...93.........8....26.163.4....9..7659.3.....9..4892...63..7431..9..",
+    "2...319.83...9..5...8.....3.1....6.....9.6..4.5..7.........946.921648...674.2.8..",
+    "896.27.1.3.485...9.5..........2351..2....4...9.3..8..7....1.9..769..........73.8.",
+    "23..6.5....1...2...564....7..984.1...8..7..2.4.25....3..31..7.58....6.9.59..8.6.1",
+    "..54.78.946.1..37..9.5231...8627.4...24..5.97........8.3.....865...98...67..5.9..",
+    "..1.643...625.3.1.....2..6.1...87.4..4.3....5.28..56...19..8.....49..17.68...1..3",
+    "6....2.....719862......6.71.6..41.....1...43.8.4........8.7...3..5.291.494...3.87",
+    "..8..7..9.3.19.....1948......794.62...357..8.96.3...1....7.9.6.8..2..3.7.7..65..1",
+    "7........5421........548...183..57...9.3614.84...97....64.5.12....61.....21...9..",
+    "..1.657.45..9...8..4..2.3.5.5.649....897.3..6.......3.9..4....3..5..62.8...53.4..",
+    "....9....8.....5..94...7.6229.73..5...19.8.7...76..1.96...749...3...6....5.21.7..",
+    "6278.9...4........1......8294.2....6....4...97.....42......29.5.7.15.3.85.4..72..",
+    ".4.2.7...8....1....2.84....35..846.9461.5...77.....435283....7..1..........3.2584",
+    ".2951.34.43..972....72.........59....7.381.9...5..4.3.3.......4.5..6.7.....9328..",
+    "839..1..6.512.6...6..5381.9........2.8..459...73....485.2..3......18.4...18...62.",
+    "32...8..165931.2....19.73.6..315..9.1...7.6..7428.....23..8.......6...7....2.5...",
+    "7....2..31...63..7.2.7..1....73245....5....4.....76.....6.9.4.8.38......2...3..95",
+    "6....3..73..928.5........91..123.8.9..47.9.6.....8...3..6....1.1.2.....67...5..28",
+    "4...879..7...4....9.26..7...8.46..5757.29.1.41.4.5.3...9.....35.....64..6.5..98.2",
+    ".7.....8.....7..249.4..8..7....2..5..1.73.49.2...5.8..7.63..51812..65.3...9......",
+    "62..49..3.3.2..8.....835...8..6.4...2.3.5.4..1.59..6..3...769.87.9...3.44...9...1",
+    "17..59....84..7...........2.4....237...3.6.9.2...9......387..6...5942.8..1.5.37.4",
+    "3...2...6.2....7..6.97.8.........9.48.49.2.1.1...3...5.5..81...4.6.951....32.74..",
+    ".1235.8..683.1.5..4.9.7.2.........4.........736.1....85.69.........27...2....1439",
+    "..9.1..5..4.58...96.8....4.2......1..1386.49.98.17...5.9........75.419.......73..",
+    ".75............2.8.821.659..3.....5...978...6.2....1.93...4....6..3.78..2...614.3",
+    ".63...8.147.5.1..991...856....2.9.5.....7..2.....359...3...2....8...43.6..7.9....",
+    "..12..8.9.8.6...3..2...1.564.51.93.263...5....987...6.85..74..3.1.5...48.4....6..",
+    "...8.35..62..1..434..5......4..2...7....8....9.8.3.1.5.9...473.8.7..165.......2..",
+    "8.6.45.7.49.6.3..851.....4.1..2.95..9587...2..6.4..89..3.8......4.5.7.....9..476.",
+    ".3...1..418.......4.9.72..6.4..6..39.1....76.9......42.2.......8...572.33...84..1",
+)
+
+#need pointers or naked/hidden combinations, but no guessing
+MEDIUM = (
+    "..........7...91......1..56.537...41...9..8..6.2...7..7....46..2...53..99.......8",
+    "..15.9...58...6..1...82.....26..........6...8...1.7..44......95.3...271......5...",
+    "....8.653.1...4...9.5....8.....761..16.4........1....2.57..9.....9....3..4...7...",
+    ".4.....573...6.2..8729....42.75.........7...6.......125..2..3...9...1.....4.....9",
+    "3.182........5.....5..6......9....24.6......552..9..61...7.6.........4..7.6..13..",
+    "23...61.....5...3..7...296.....642.....7...86...3.......12.53...5.....4.9....1...",
+    "..7...43.4...61.....3....1.....4.5.2.25.......3..8.1.....93..7.....2.6.3..9..8...",
+    ".8...7..452......3....4..6.....1.....5.9..3....6..891..9..8.....3..256.7........5",
+    ".1......5.......8.7....3.6.628...............5..96.27.3.9.7.1.......6.3.4...5...8",
+    "96.1.......42...93.8...6...........1.37...8....9.52......5....9....4721...2..9.7.",
+    "..2.....59.486..1...59...4......6...7..2.....1....7.8.8..6..3.4..3...1...9..81.5.",
+    "745.296..36.7..................71..923..6...1....8.....9..5..........4....6...872",
+    "1..98.6..2.7.46........34.......4.61..6..9...45........287....5..4...8..6.....9..",
+    ".8..........2..69.7.4.....2..91.2....4..5......78.6......7.9..89.....3...5..6...4",
+    ".1...3.2.....7..4...3...1.79..72..3.2.......41.5.96...6.9..............282.9.14..",
+    ".....78.9..7...63..6.92.1.......4.....21.35...8........75....9...3.8...........26",
+    ".2..1..5....3.4...7...59....5..26...4...3.....8...59.....6.......9...72.3....7.8.",
+    "....46...6..9....1.32.......9....47..4.3..2.5.5.4...93.....36....8...3.291.......",
+    "1..92......67..........3..921..7.8........6..7..41...............78.6..48.5.41.9.",
+    "...2...4....5.9.....8.615.3.6........3...2..9.2..3...1...9....8..7......4.1...372",
+    ".....3.58.4........78..94...5..7..1....4.23.............1.8..63..4.5.....2..6...7",
+    ".6.51...91...2..5....78..6...73....635.......82......1..1.9...........8778.2....5",
+    "...2.........96.4...871....9....2.3.7..3..5..5.........25.4..9.49......8.....91..",
+    "285...9.......98.5..7..3..........6....36.28.9.65...7.......6...3..85...6...41...",
+    "36....5....7..5..29.5........8.....6.3.....8.....91...5...3..9887.5...1..1.6...3.",
+    ".......4...6..2.7....4318.91.....4.75.........9..78....4......2..324..9..8...6...",
+    ".1.........98.5.......63..9..5....2....3...4...2.74..3.86.4.7....3...5...9....6..",
+    ".5....8...7...9..1..9.1..7.8253.......6.....2...5....4.9...8.27.......6...3.27.1.",
+    "8..4......3...1.85.9.3...1.61.9.......5.....9.7.....5.42.1.6...........87.3.....4",
+    ".4...7....9..418....59...2.6.......43....8..6...4.51....9.7..8...2.....5.73.....2",
+    "6....52.42......9...1....5......2..73....7...8..6....2.......3...5.8...97243...1.",
+    "..4.7......7..8..46..3............8....9...517.25...3.8..1...6........9..9.8.3..5",
+    ".3..8.6.......42.......2.9.7.891....5...6..4.6.1.........7..4...5...3.....7.5..6.",
+    "..4..1......34.2.....8.6.1.1.....3.86.5..7.....8...95...9..46.....15....5.......1",
+    "..........61.4.93....3.8..6..3.....4.48......2....7...5...7.2.....95.4..83..6...1",
+    "84.......1..57..8.5..9...2........95...2.....6.7.......6..9.4.3.....8.5..3....2..",
+    "94...2..6.3....75.....1.24.78...4...2......8..9.1..4..5...41..8...9..67..2.......",
+    "..5268.....69......71..5.........1..3....29..1..7..63......1....9.....5.2..6.....",
+    "...35.....7..813........182.......3.6.7.3....4.86............9..5.94..7.9..8..6..",
+    "6......2..3.2....9...79...37....9..4.......3......829.873.2....45..8........14..5",
+    "..8....1.6....1253.4..23...5.1.9.8.....6.5....76....2......4.6.......53.....3.9..",
+    ".16...4..4..93..........27.....57..8.........93.2.86..6..8.3..2.....9.1..9.7.....",
+    "3256........57......6..9.2.5.2...4...7.....588.4...1......3.....9.....8626.9...7.",
+    "3....5......684.7........69.4........2.4..3...5..37..4..63.125...1......9..8..4..",
+    "3.95..6...84......5...46......895..4........2....2..9.9.5....2......79.6..8.....7",
+    "5....2...........9...4..37.3....9.2..2...748.......1...8.7..9.4....1...8945.3..6.",
+    "1..5...6.2...6..9..8...7.....2.19....1.....36...876...5...81.7.9...5.41.7....43..",
+    ".4..32....1.....3.6..4.8..13......6.......249.9.8....525...7..3.6.....7......39.2",
+    "75...9...82.7.4.6.1..5.....97.6...24...3.......3....9....4.32.........15...2.....",
+    "....8.47...2...9.....635...........696...3..875...6...6.74..5..813.7.............",
+    "...2.5...4...6.9...2...9.3.28.47....5......6.3.6.2..7....9...45......1..87.65....",
+    "...49.......27.6.4.231.6...2...4.5.7.....1.4....5.9..2.8.....7....6..3...95......",
+    "..3...2.9.9..7..1.8.4....6....627............7.6..4...9.....5.2.6...89...8.5.23..",
+    "......7...1......4.4..3.5.9.85.1..9.123..8....9.5.6......95..4...8..........43.6.",
+    "....81.3..5....4.....2..5.1..4...1.3.6.....8...867......5......1....7.4..821.9...",
+    "....9.....3...6514..674.2.3.27.5....3.59.....1.......74.......6...8........3.9..2",
+    ".957...2....36..4..6.2..5....1.........4.8.......3..64.34.9...........19.7....3.8",
+    ".......7..9..3..616.5..8......1.25....7.83.....1...9............746..2..26.....3.",
+    ".....7..2..5.9.8..8.....91..385..4............12.....6..3.29...7....6....5.47.2.9",
+    "2...3.......6..91..3.58.4....6.4.......7...4..2......165.....2.9..3..8...14.9...7",
+)
+
+#the rules stall on these, so they need the search; the first ones are well known hard puzzles
+HARD = (
+    "1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1",
+    "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "......25...........51..9..8.64......8...7..1..9.351..4.19..4........736....162...",
+    "2.3.8..7..8...15..9....4..8.3...2.8........2....67..5..14.28..3..7.............1.",
+    "5.6..1.2..9..........3..1.4...6..........2..92...7....7...8.5......2..41.81.96...",
+    "....6..7........956.5..2......9.1.3...12.....5...84....2.35.9.....4....39.8......",
+    ".3.58......4.7.........1.2.3....4..2..9..7.4...612...5......7.881.........2...564",
+    ".2...9....457.....8....15.4....2.3.16...1..5....587...2..3....8......2..37....6..",
+    ".7...3..6..9......21......574..1..2...3.........28.7....4....7.63...9..11...2..4.",
+    "...9....21..2..6.3.6.....71..........16..4...83.61....38..4..1..5.3..8...9..8..54",
+    ".8...53....78.......9.7..65....2....7.2..36..9...8......85...14..6...5.317..3.9..",
+    "3.......8...5317.4.....72......8...75....6...8.792...576..42.....8........4....9.",
+    "...8...6.8.7...4..6.....2.....7..1.....4.1.2..1...583..2.1..7...9.2.8..63...7....",
+    "4..8..67..8.1...5.9.......4..6....8..2..56..........4...8..1.......9.51.26...8.3.",
+    ".........538..2.........348...6..4...1.78...5.65...9.....9..753.51.6......9.2..6.",
+    "2..7....6.7..5.8..1......4........9....164..5.64.9.....5..37.6...9......3....2.1.",
+    "...........65.1...94......8.2.7...1.7.......4.6.23.5..41...9..6.7..2.43...2......",
+    "..7.1....13..8.......9...35....57.........5498....2...5...2..6.4.15..3.8.6....2..",
+    "2.......7.3..6.1......5...4........9.76..8.1...4.73..6.473.....5....689.....8....",
+    "..75.92..2.........5.....1.....8.951.31....67......3...2..3..9.4.....5...8..47...",
+    "........8......59375..6........1.4..68...2........42.5....7...41.3.4....8.53..6..",
+    "..3...8...6..2..3..5...6..2896..5..1.......95...1......7.....5.5.48.1......3.....",
+    "24.9...6.5.....8..........7.....24.396..3.1.....8.4....7..2...8..24..95...8......",
+    "....35...1..8......8.2.6...847...6.....9.3.5..9..4........2..8.21......5..4...3.9",
+    ".....3.8....2....18.3.967.25..........7.4....6.....87.98....2..2...69.....1....53",
+    ".....832.3.879....4...5..7..2.34......5..9........1..8....1.7.5.59...41.......2..",
+    "..2.4.96.....35.2.3.9......2.....48.......3..98..7...681...7.......5.6..7....25..",
+    "....16...9.....4.6.5.8..7..8..3...9.....2...5194..........72..1.8.4..6..3........",
+    "..1.......4..519..8..3......17......6...9..4..9....653.5.67..3.2.6.......3.2.....",
+    ".....9.4.4...5..6...218..5.27........3.4....15....24....3..18.2..7.2..368.....5..",
+    "..2..7...7..2..51.68..5.....937...8.8.....9.1........5..4...19..6..92.....76....8",
+    ".....4.6....9..1..28.1..4...7......1.213.7.....5...8.....7.5.49....4..829.....5..",
+    ".8..5...4.....31.....9....8.3.....8...45.......2..695.273.1.5...5.2.......9....3.",
+    "6..4...1.85.7.......2...7............1..7.9......1..6...6.3.49.2.7..4.5...3..9..1",
+    ".825.......5.8..7..97.2......67....2...3.....2...4..65.7.1.3..4......5......54.3.",
+    ".....7.52..8.6.......5..9...87.............2.3.9486..........3549.2...7.2..3....4",
+    "2.3..5......2....1.7.1..4....7......3..42...74.83..9...52....6.8.....193.......5.",
+    "....9..7.4.....38.5.3....1.68.9....72.5.4........2.8.61..43......2....319..7.....",
+    "1...8962..7....14..3..1....3..87......4..37.2...........81........9....47...349..",
+    "...83.....784.9.5......1...4.....9.......2..1..1.....3.6..1.......5..3.495427.8..",
+    "1..7.5.8...........84.....6.1.3....87..1...92....8.1.......6.7.842..35....3.1....",
+    "..9....6.....6487......8...7...392..4..7...8.6.3....4........17...5.3.9.1.....6..",
+)
+
+#minimal 17 clue puzzles
+SEVENTEEN_CLUE = (
+    ".......1.4.........2...........5.4.7..8...3....1.9....3..4..2...5.1........8.6...",
+    ".......1.4.........2...........5.6.4..8...3....1.9....3..4..2...5.1........8.7...",
+    ".......12....35......6...7.7.....3.....4..8..1...........12.....8.....4..5....6..",
+    ".......12..36..........7...41..2.......5..3..7.....6..28.....4....3..5...........",
+    ".......12..8.3...........4.12.5..........47...6.......5.7...3.....62.......1.....",
+    ".......12.4..5.........9....7.6..4.....1............5.....875..6.1...3..2........",
+    ".......12.5.4............3.7..6..4....1..........8....92....8.....51.7.......3...",
+    ".......123......6.....4....9.....5.......1.7..2..........35.4....14..8...6.......",
+    ".......124...9...........5..7.2.....6.....4.....1.8....18..........3.7..5.2......",
+    ".......125....8......7.....6..12....7.....45.....3.....3....8.....5..7...2.......",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+)
+
+CORPORA = {"easy":EASY,"medium":MEDIUM,"hard":HARD,"17-clue":SEVENTEEN_CLUE}
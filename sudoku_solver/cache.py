@@ -0,0 +1,212 @@
+import collections
+import itertools
+import sqlite3
+
+from .encoding import field_to_string, field_from_string
+from .solver import SudokuSolver, get_default_square_size
+
+#orderings of the rows and cols tried when looking for the smallest form
+MAX_CANDIDATES = 32
+
+
+#where a sudoku went to get its canonical form: cell (row, col) of the canonical sudoku is cell
+#(rows[row], cols[col]) of the original one, read after transposing it if transposed is set,
+#and number n of the original sudoku is numbers[n-1] in the canonical one
+class Transform:
+
+    def __init__(self, transposed, rows, cols, numbers):
+        self.transposed = transposed
+        self.rows = rows
+        self.cols = cols
+        self.numbers = numbers
+
+    def apply(self, field):
+        if self.transposed:
+            field = [list(col) for col in zip(*field)]
+        return [[self._relabel(field[row][col],self.numbers) for col in self.cols] for row in self.rows]
+
+    #maps a field of the canonical sudoku, e.g. its solution, back to the original one
+    def restore(self, field):
+        originals = [0]*len(self.numbers)
+        for number, canonical in enumerate(self.numbers):
+            originals[canonical-1] = number+1
+        restored = [[None]*len(field) for row in field]
+        for row, original_row in enumerate(self.rows):
+            for col, original_col in enumerate(self.cols):
+                restored[original_row][original_col] = self._relabel(field[row][col],originals)
+        if self.transposed:
+            restored = [list(col) for col in zip(*restored)]
+        return restored
+
+    @staticmethod
+    def _relabel(cell, numbers):
+        return "" if cell == "" else numbers[int(cell)-1]
+
+    def __repr__(self):
+        return "Transform(transposed={}, rows={}, cols={}, numbers={})".format(self.transposed,self.rows,self.cols,self.numbers)
+
+
+#the same string for sudokus that only differ by relabelled numbers, swapped rows or cols within a band or stack,
+#swapped bands or stacks, or transposition; returns the string and the Transform leading to it
+#rows and cols are ordered by where their clues are and only up to MAX_CANDIDATES ties are tried, so rarely two
+#such sudokus get different strings, which only costs a cache miss
+def canonical_form(field, square_height = None, square_width = None):
+    if square_height is None or square_width is None:
+        square_height, square_width = get_default_square_size(len(field))
+    orientations = [(False,field)]
+    if square_height == square_width:
+        orientations.append((True,[list(col) for col in zip(*field)]))
+    best = None
+    for transposed, oriented in orientations:
+        clues = [[col for col, cell in enumerate(row) if cell != ""] for row in oriented]
+        col_clues = [[row for row in range(len(oriented)) if col in clues[row]] for col in range(len(oriented))]
+        row_keys = _line_keys(clues,col_clues)
+        col_keys = _line_keys(col_clues,clues)
+        candidates = itertools.product(_line_orders(row_keys,square_height),_line_orders(col_keys,square_width))
+        for rows, cols in itertools.islice(candidates,MAX_CANDIDATES):
+            text, numbers = _relabelled(oriented,rows,cols)
+            if best is None or text < best[0]:
+                best = (text,Transform(transposed,rows,cols,numbers))
+    return "{}x{}:{}".format(square_height,square_width,best[0]), best[1]
+
+#the number of clues of a line and the numbers of clues of the lines crossing it at them
+def _line_keys(clues, crossing_clues):
+    return [(len(line),sorted(len(crossing_clues[cell]) for cell in line)) for line in clues]
+
+#orders of the lines with the biggest keys first, bands by the keys of their lines, trying every order of ties
+def _line_orders(keys, band_height):
+    bands = [list(range(start,start+band_height)) for start in range(0,len(keys),band_height)]
+    groups = []
+    for band in bands:
+        band.sort(key=lambda line: keys[line],reverse=True)
+        groups.extend(_ties(band,lambda line: keys[line]))
+    band_keys = {band[0]:[keys[line] for line in band] for band in bands}
+    bands.sort(key=lambda band: band_keys[band[0]],reverse=True)
+    band_groups = _ties(bands,lambda band: band_keys[band[0]])
+    for band_order in itertools.product(*(itertools.permutations(group) for group in band_groups)):
+        ordered_bands = [band for group in band_order for band in group]
+        for line_orders in itertools.product(*(itertools.permutations(group) for group in groups)):
+            chosen = {group[0]:order for group, order in zip(groups,line_orders)}
+            yield tuple(line for band in ordered_bands for line in _regroup(band,chosen))
+
+def _ties(items, key):
+    return [list(group) for _, group in itertools.groupby(items,key)]
+
+def _regroup(band, chosen):
+    lines = []
+    for line in band:
+        if line in chosen:
+            lines.extend(chosen[line])
+    return lines
+
+#the field read in the given order, numbers renamed 1, 2, ... by first appearance
+def _relabelled(field, rows, cols):
+    size = len(field)
+    numbers = [0]*size
+    next_number = 1
+    cells = []
+    for row in rows:
+        for col in cols:
+            cell = field[row][col]
+            if cell == "":
+                cells.append("")
+                continue
+            if numbers[int(cell)-1] == 0:
+                numbers[int(cell)-1] = next_number
+                next_number += 1
+            cells.append(numbers[int(cell)-1])
+    for number in range(size):
+        if numbers[number] == 0:
+            numbers[number] = next_number
+            next_number += 1
+    return field_to_string([cells]), numbers
+
+
+#solutions of sudokus in canonical form, the max_size most recently used ones kept in memory
+#with a path the solutions are also kept in an sqlite database there and survive restarts
+class SolutionCache:
+
+    #solutions written to the database before a commit
+    COMMIT_EVERY = 100
+
+    def __init__(self, max_size = 10000, path = None, engine = "bitmask"):
+        self.max_size = max_size
+        self.engine = engine
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._solutions = collections.OrderedDict()
+        self._database = None
+        self._uncommitted = 0
+        if path is not None:
+            self._database = sqlite3.connect(path)
+            self._database.execute("CREATE TABLE IF NOT EXISTS solutions (puzzle TEXT PRIMARY KEY, solution TEXT)")
+
+    #like SudokuSolver(field).solve_sudoku(), raises ValueError if the sudoku has no solution
+    #the field is checked as given before it is transformed, so an InvalidSudokuError and its cells are about it
+    def solve_sudoku(self, field, square_height = None, square_width = None):
+        SudokuSolver(field,self.engine,square_height,square_width)
+        if square_height is None or square_width is None:
+            square_height, square_width = get_default_square_size(len(field))
+        key, transform = canonical_form(field,square_height,square_width)
+        solution = self._get(key)
+        if solution is None:
+            self.misses += 1
+            result = SudokuSolver(transform.apply(field),self.engine,square_height,square_width).solve()
+            solution = field_to_string(result.field) if result.solved else ""
+            self._put(key,solution)
+            self._store(key,solution)
+        else:
+            self.hits += 1
+        if solution == "":
+            raise ValueError("The sudoku has no solution")
+        return transform.restore(field_from_string(solution))
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def _get(self, key):
+        if key in self._solutions:
+            self._solutions.move_to_end(key)
+            return self._solutions[key]
+        if self._database is None:
+            return None
+        row = self._database.execute("SELECT solution FROM solutions WHERE puzzle = ?",(key,)).fetchone()
+        if row is None:
+            return None
+        self._put(key,row[0])
+        return row[0]
+
+    def _put(self, key, solution):
+        self._solutions[key] = solution
+        if len(self._solutions) > self.max_size:
+            self._solutions.popitem(last=False)
+            self.evictions += 1
+
+    def _store(self, key, solution):
+        if self._database is None:
+            return
+        self._database.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)",(key,solution))
+        self._uncommitted += 1
+        if self._uncommitted >= SolutionCache.COMMIT_EVERY:
+            self.flush()
+
+    def flush(self):
+        if self._database is not None:
+            self._database.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        if self._database is not None:
+            self.flush()
+            self._database.close()
+            self._database = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return "SolutionCache(size={}, hits={}, misses={}, evictions={})".format(len(self),self.hits,self.misses,self.evictions)
@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import sys
+
+from . import benchmark, corpus, generator, service
+from .batch import solve_many
+from .encoding import field_to_string
+from .puzzle_file import read_puzzles, write_results
+from .solver import SudokuSolver, SolveResult, SolverStats
+
+
+def main(argv = None):
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    return args.command(args)
+
+def _build_parser():
+    parser = argparse.ArgumentParser(prog="python -m sudoku_solver")
+    commands = parser.add_subparsers(required=True,metavar="command")
+
+    solve = commands.add_parser("solve",help="solve a file with one puzzle per line")
+    solve.add_argument("input",help="puzzle file, - for stdin")
+    solve.add_argument("-o","--output",default="-",help="solution file, - for stdout (default)")
+    solve.add_argument("-w","--workers",type=int,default=None,help="worker processes, 0 solves in this process (default: all cores)")
+    solve.add_argument("--chunksize",type=int,default=64,help="puzzles sent to a worker at once (default: 64)")
+    solve.add_argument("--engine",choices=SudokuSolver.ENGINES,default=None)
+    solve.add_argument("--time-limit",type=float,default=None,help="seconds per puzzle")
+    solve.add_argument("--techniques",type=_technique_list,default=None,metavar="NAME,...",
+                       help="rules to apply, in the order to try them (default: {}; also: {})".format(
+                           ",".join(SudokuSolver.TECHNIQUES),",".join(SudokuSolver.EXTRA_TECHNIQUES)))
+    solve.add_argument("--stats",action="store_true",help="print the time and deductions of every technique to stderr")
+    solve.set_defaults(command=_solve)
+
+    bench = commands.add_parser("bench",help="benchmark the solver on the bundled corpora")
+    bench.add_argument("corpora",nargs="*",metavar="corpus",
+                       help="corpora to run: {} (default: all)".format(", ".join(benchmark.CORPORA)))
+    bench.add_argument("--engine",choices=SudokuSolver.ENGINES,default=None)
+    bench.add_argument("--repeat",type=int,default=3,help="runs over every corpus (default: 3)")
+    bench.add_argument("--save",metavar="FILE",help="write the report as json, e.g. to make a baseline")
+    bench.add_argument("--baseline",metavar="FILE",help="json report to compare against")
+    bench.add_argument("--threshold",type=float,default=benchmark.DEFAULT_THRESHOLD,
+                       help="relative change reported as a regression (default: {})".format(benchmark.DEFAULT_THRESHOLD))
+    bench.add_argument("--generate",type=int,default=20,metavar="COUNT",
+                       help="sudokus to generate for the generator throughput, 0 skips it (default: 20)")
+    bench.set_defaults(command=_bench)
+
+    generate = commands.add_parser("generate",help="generate unique sudokus, one per line")
+    generate.add_argument("-n","--count",type=int,default=1,help="sudokus to generate (default: 1)")
+    generate.add_argument("-o","--output",default="-",help="output file, - for stdout (default)")
+    generate.add_argument("-w","--workers",type=int,default=None,help="worker processes, 0 generates in this process (default: all cores)")
+    generate.add_argument("--difficulty",choices=generator.DIFFICULTIES,default=None,help="hardest rule needed to solve them")
+    generate.add_argument("--symmetry",choices=generator.SYMMETRIES,default="rotational",help="pattern of the clues (default: rotational)")
+    generate.add_argument("--size",type=int,default=9,help="rows of the board (default: 9)")
+    generate.add_argument("--seed",type=int,default=None,help="seed of the first sudoku, the next ones use the following numbers")
+    generate.set_defaults(command=_generate)
+
+    serve = commands.add_parser("serve",help="solve sudokus sent as json over http, for local testing")
+    serve.add_argument("--host",default="127.0.0.1",help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port",type=int,default=8080,help="port to listen on (default: 8080)")
+    serve.add_argument("-w","--workers",type=int,default=None,help="worker processes (default: all cores)")
+    serve.add_argument("--max-pending",type=int,default=None,
+                       help="requests accepted at once before answering 503 (default: {} per worker)".format(service.PENDING_PER_WORKER))
+    serve.add_argument("--timeout",type=float,default=None,help="seconds per sudoku before its worker is restarted")
+    serve.add_argument("--engine",choices=SudokuSolver.ENGINES,default=None)
+    serve.set_defaults(command=_serve)
+
+    pack = commands.add_parser("pack",help="write a file with one puzzle per line as a binary corpus")
+    pack.add_argument("input",help="puzzle file, - for stdin")
+    pack.add_argument("output",help="corpus file")
+    pack.add_argument("--no-solutions",dest="solutions",action="store_false",help="leave out the solution column")
+    pack.set_defaults(command=_pack)
+
+    solve_corpus = commands.add_parser("solve-corpus",help="solve a binary corpus, writing the results into it")
+    solve_corpus.add_argument("input",help="corpus file with a solution column")
+    solve_corpus.add_argument("-w","--workers",type=int,default=None,help="worker processes, 0 solves in this process (default: all cores)")
+    solve_corpus.add_argument("--engine",choices=SudokuSolver.ENGINES,default=None)
+    solve_corpus.add_argument("--time-limit",type=float,default=None,help="seconds per puzzle")
+    solve_corpus.add_argument("--resolve",action="store_true",help="solve the puzzles that already have a result again")
+    solve_corpus.set_defaults(command=_solve_corpus)
+    return parser
+
+def _solve(args):
+    input_file = sys.stdin if args.input == "-" else open(args.input,encoding="ascii")
+    output_file = sys.stdout if args.output == "-" else open(args.output,"w",encoding="ascii")
+    try:
+        results = solve_many(read_puzzles(input_file),workers=args.workers,chunksize=args.chunksize,
+                             engine=args.engine,time_limit=args.time_limit,collect_stats=args.stats,
+                             techniques=args.techniques)
+        stats = SolverStats()
+        solved, total = write_results(_merging_stats(results,stats),output_file)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    print("Solved {} of {} puzzles".format(solved,total),file=sys.stderr)
+    if args.stats:
+        print(stats.format(),file=sys.stderr)
+    return 0 if solved == total else 1
+
+def _technique_list(value):
+    techniques = [name for name in value.split(",") if name]
+    for name in techniques:
+        if name not in SudokuSolver.TECHNIQUES+SudokuSolver.EXTRA_TECHNIQUES:
+            raise argparse.ArgumentTypeError("unknown technique {!r}".format(name))
+    return techniques
+
+def _merging_stats(results, stats):
+    for result in results:
+        if result.stats is not None:
+            stats.merge(result.stats)
+        yield result
+
+def _bench(args):
+    unknown = [name for name in args.corpora if name not in benchmark.CORPORA]
+    if unknown:
+        print("Unknown corpus: {}".format(", ".join(unknown)),file=sys.stderr)
+        return 2
+    #a baseline of another engine is refused before spending the time on the run
+    baseline = benchmark.load_report(args.baseline) if args.baseline else None
+    engine = args.engine or SudokuSolver.ENGINES[0]
+    if baseline is not None and baseline["engine"] != engine:
+        print("Can't compare against {}: the baseline is of the {} engine, this run of the {} engine".format(
+            args.baseline,baseline["engine"],engine),file=sys.stderr)
+        return 2
+    report = benchmark.run_benchmark(args.corpora,args.engine,args.repeat,args.generate)
+    print(benchmark.format_report(report))
+    if args.save:
+        benchmark.save_report(report,args.save)
+    if baseline is None:
+        return 0
+    regressions = benchmark.find_regressions(baseline,report,args.threshold)
+    if baseline["python"] != report["python"]:
+        print("Warning: the baseline ran on python {}, this run on python {}".format(baseline["python"],report["python"]),
+              file=sys.stderr)
+    for regression in regressions:
+        print("Regression: "+regression)
+    if not regressions:
+        print("No regressions against {}".format(args.baseline))
+    return 1 if regressions else 0
+
+def _generate(args):
+    output_file = sys.stdout if args.output == "-" else open(args.output,"w",encoding="ascii")
+    difficulties = {}
+    try:
+        for puzzle in generator.generate_many(args.count,args.difficulty,args.symmetry,args.seed,args.size,workers=args.workers):
+            output_file.write(field_to_string(puzzle.field)+"\n")
+            difficulties[puzzle.difficulty] = difficulties.get(puzzle.difficulty,0)+1
+    finally:
+        if output_file is not sys.stdout:
+            output_file.close()
+    print("Generated {}".format(", ".join("{} {}".format(count,name) for name, count in sorted(difficulties.items()))),file=sys.stderr)
+    return 0
+
+def _serve(args):
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+async def _serve_forever(args):
+    async with service.AsyncSolver(args.workers,args.max_pending,args.timeout,args.engine) as solver:
+        server = await service.serve_http(solver,args.host,args.port)
+        print("Listening on http://{}:{}".format(args.host,args.port),file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+def _pack(args):
+    input_file = sys.stdin if args.input == "-" else open(args.input,encoding="ascii")
+    last = [None]
+    try:
+        count = corpus.write_corpus(args.output,_remembering_last(read_puzzles(input_file),last),solutions=args.solutions)
+    except ValueError as error:
+        print("Nothing packed, {}: {}".format(error,last[0]),file=sys.stderr)
+        return 1
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+    print("Packed {} puzzles".format(count),file=sys.stderr)
+    return 0
+
+#the puzzle being packed when an error comes up is the last one read
+def _remembering_last(puzzles, last):
+    for puzzle in puzzles:
+        last[0] = puzzle
+        yield puzzle
+
+def _solve_corpus(args):
+    counts = corpus.solve_corpus(args.input,args.workers,args.engine,args.time_limit,resolve=args.resolve)
+    print(", ".join("{} {}".format(count,status) for status, count in sorted(counts.items())) or "No puzzles",file=sys.stderr)
+    return 0 if set(counts) <= {SolveResult.SOLVED} else 1
@@ -0,0 +1,272 @@
+import collections
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import BatchResult
+from .encoding import values_from_bytes
+from .solver import SudokuSolver, SolveResult, get_default_square_size
+
+#a binary file of sudokus: a header, then one fixed size record per sudoku holding its cells packed two to a byte
+#(one per byte for boards of 16 rows and more), so a 9x9 sudoku takes 41 bytes; with a solution column every record
+#also has room for the solution, packed the same way, and a status byte, which are filled in later
+
+#magic, format version, square height, square width, flags, number of sudokus
+HEADER = struct.Struct("<4sBBBBQ")
+MAGIC = b"SDKC"
+VERSION = 1
+#flags of the header
+HAS_SOLUTIONS = 1
+#the status byte of a record, 0 while the sudoku isn't solved
+STATUSES = (None,SolveResult.SOLVED,SolveResult.STALLED,SolveResult.CONTRADICTION,SolveResult.BUDGET_EXCEEDED,BatchResult.ERROR)
+#records written to the file at once
+RECORDS_PER_WRITE = 4096
+#shards per worker in solve_corpus(), so a slow shard doesn't hold up the others for long
+SHARDS_PER_WORKER = 4
+
+
+#a corpus file mapped into memory; corpus[i] are the numbers of sudoku i, 0 for an empty cell, ready for
+#SudokuSolver.from_array(), and corpus[start:stop] is a corpus of a range of the sudokus on the same mapping
+#opened writable, the solutions and statuses can be written in place with set_result()
+class Corpus:
+
+    def __init__(self, path, writable = False, start = 0, stop = None):
+        self.path = path
+        self.writable = writable
+        with open(path,"r+b" if writable else "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError("{} is too short for a corpus".format(path))
+            magic, version, self.square_height, self.square_width, flags, count = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("{} is not a corpus".format(path))
+            if version != VERSION:
+                raise ValueError("Unsupported corpus version {}, expected {}".format(version,VERSION))
+            self._map = mmap.mmap(file.fileno(),0,access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        self.size = self.square_height*self.square_width
+        self.cells = self.size*self.size
+        self.has_solutions = bool(flags & HAS_SOLUTIONS)
+        self._cell_bits = _cell_bits(self.size)
+        self._packed_size = _packed_size(self.cells,self._cell_bits)
+        self._record_size = 2*self._packed_size+1 if self.has_solutions else self._packed_size
+        if len(self._map) < HEADER.size+count*self._record_size:
+            raise ValueError("{} is truncated, expected {} sudokus".format(path,count))
+        self._view = memoryview(self._map)
+        self.start, self.stop, step = slice(start,stop).indices(count)
+        self.stop = max(self.start,self.stop)
+
+    def __len__(self):
+        return self.stop-self.start
+
+    def __getitem__(self, index):
+        if isinstance(index,slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Corpus slices can't have a step")
+            return self._range(self.start+start,self.start+max(start,stop))
+        return self.values(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.values(index)
+
+    #the packed cells of sudoku i, a view of the mapping without copying
+    def packed(self, index):
+        offset = self._offset(index)
+        return self._view[offset:offset+self._packed_size]
+
+    #the numbers of the cells of sudoku i
+    def values(self, index):
+        offset = self._offset(index)
+        return _unpack(self._map[offset:offset+self._packed_size],self.cells,self._cell_bits)
+
+    def solver(self, index, engine = "bitmask", collect_stats = False):
+        return SudokuSolver.from_array(self.values(index),engine,self.square_height,self.square_width,collect_stats)
+
+    #the status of sudoku i, one of STATUSES, and the numbers of its solution or of the grid reached
+    #the status is None, and there are no numbers, while no result has been written
+    def result(self, index):
+        offset = self._solution_offset(index)
+        status = STATUSES[self._map[offset+self._packed_size]]
+        if status is None:
+            return None, None
+        return status, _unpack(self._map[offset:offset+self._packed_size],self.cells,self._cell_bits)
+
+    #values are the numbers of the solution or of the grid reached, or a string in the format of encoding.py
+    def set_result(self, index, status, values = None):
+        if not self.writable:
+            raise ValueError("The corpus was opened read only")
+        offset = self._solution_offset(index)
+        if values is None:
+            values = bytes(self.cells)
+        elif isinstance(values,str):
+            values = values_from_bytes(values.encode("ascii","replace"))
+        if len(values) != self.cells:
+            raise ValueError("Expected {} cells, got {}".format(self.cells,len(values)))
+        self._map[offset:offset+self._packed_size] = _pack(values,self._cell_bits)
+        self._map[offset+self._packed_size] = STATUSES.index(status)
+
+    #the shard-th of count ranges of about the same length, for splitting the corpus between workers
+    def shard(self, shard, count):
+        if not 0 <= shard < count:
+            raise ValueError("Expected a shard from 0 to {}, got {}".format(count-1,shard))
+        return self._range(self.start+len(self)*shard//count,self.start+len(self)*(shard+1)//count)
+
+    def flush(self):
+        if self.writable:
+            self._map.flush()
+
+    #closes the mapping, which the slices and shards share
+    def close(self):
+        if not self._map.closed:
+            self.flush()
+            self._view.release()
+            self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    #a worker process opens the file again for its range
+    def __reduce__(self):
+        return Corpus, (self.path,self.writable,self.start,self.stop)
+
+    def __repr__(self):
+        return "Corpus({!r}, {}x{}, sudokus {} to {})".format(self.path,self.size,self.size,self.start,self.stop)
+
+    def _range(self, start, stop):
+        corpus = Corpus.__new__(Corpus)
+        corpus.__dict__.update(self.__dict__)
+        corpus.start = start
+        corpus.stop = stop
+        return corpus
+
+    def _offset(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Sudoku {} is out of range for {} sudokus".format(index,len(self)))
+        return HEADER.size+(self.start+index)*self._record_size
+
+    def _solution_offset(self, index):
+        if not self.has_solutions:
+            raise ValueError("The corpus has no solution column")
+        return self._offset(index)+self._packed_size
+
+
+#writes sudokus, strings in the format of encoding.py or flat sequences of numbers, to a new corpus file
+#the squares default to the most square shape that fits the first sudoku; returns the number of sudokus written
+#the file is written under a temporary name and only renamed to path when every sudoku was valid, so an existing
+#file isn't lost and a half written one isn't left behind
+def write_corpus(path, puzzles, square_height = None, square_width = None, solutions = True):
+    temporary_path = "{}.{}.tmp".format(path,os.getpid())
+    try:
+        with open(temporary_path,"wb") as file:
+            count = _write_records(file,puzzles,square_height,square_width,solutions)
+        os.replace(temporary_path,path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    return count
+
+def _write_records(file, puzzles, square_height, square_width, solutions):
+    records = []
+    count = 0
+    file.write(bytes(HEADER.size))
+    for puzzle in puzzles:
+        try:
+            values = values_from_bytes(puzzle.strip().encode("ascii","replace")) if isinstance(puzzle,str) else bytes(puzzle)
+        except (ValueError,TypeError) as error:
+            raise ValueError("Sudoku {}: {}".format(count,error))
+        if count == 0:
+            size = int(len(values)**0.5)
+            if square_height is None or square_width is None:
+                square_height, square_width = get_default_square_size(size)
+            size = square_height*square_width
+            cell_bits = _cell_bits(size)
+            blank_result = bytes(_packed_size(size*size,cell_bits)+1) if solutions else b""
+        if len(values) != size*size:
+            raise ValueError("Sudoku {} has {} cells, expected {}".format(count,len(values),size*size))
+        if max(values) > size:
+            raise ValueError("Sudoku {} has numbers above {}".format(count,size))
+        records.append(_pack(values,cell_bits)+blank_result)
+        count += 1
+        if len(records) == RECORDS_PER_WRITE:
+            file.write(b"".join(records))
+            records = []
+    file.write(b"".join(records))
+    if count == 0:
+        square_height, square_width = square_height or 3, square_width or 3
+    file.seek(0)
+    file.write(HEADER.pack(MAGIC,VERSION,square_height,square_width,HAS_SOLUTIONS if solutions else 0,count))
+    return count
+
+#solves the sudokus of a corpus with a solution column and writes the results into the file, the shards of the
+#corpus in parallel on a process pool; workers=0 solves in the calling process
+#sudokus that already have a result are skipped unless resolve is set; returns how many sudokus got every status
+def solve_corpus(path, workers = None, engine = None, time_limit = None, techniques = None, resolve = False):
+    with Corpus(path) as corpus:
+        if not corpus.has_solutions:
+            raise ValueError("{} has no solution column".format(path))
+        count = len(corpus)
+    options = (engine,time_limit,techniques,resolve)
+    if workers == 0:
+        return dict(_solve_shard(path,0,count,options))
+    workers = workers or os.cpu_count()
+    shards = max(1,min(count,workers*SHARDS_PER_WORKER))
+    bounds = [(count*shard//shards,count*(shard+1)//shards) for shard in range(shards)]
+    counts = collections.Counter()
+    with ProcessPoolExecutor(workers) as executor:
+        for shard_counts in executor.map(_solve_shard,[path]*shards,*zip(*bounds),[options]*shards):
+            counts.update(shard_counts)
+    return dict(counts)
+
+#runs in the worker processes, every worker maps the file itself and writes only its own records
+def _solve_shard(path, start, stop, options):
+    engine, time_limit, techniques, resolve = options
+    counts = collections.Counter()
+    with Corpus(path,True,start,stop) as shard:
+        for index in range(len(shard)):
+            status = shard.result(index)[0]
+            if status is None or resolve:
+                try:
+                    result = shard.solver(index,engine or SudokuSolver.ENGINES[0]).solve(time_limit=time_limit,techniques=techniques)
+                    status = result.status
+                    shard.set_result(index,status,[cell or 0 for row in result.field for cell in row])
+                except ValueError:
+                    status = BatchResult.ERROR
+                    shard.set_result(index,status)
+            counts[status] += 1
+    return counts
+
+
+def _cell_bits(size):
+    return 4 if size < 16 else 8
+
+def _packed_size(cells, cell_bits):
+    return (cells+1)//2 if cell_bits == 4 else cells
+
+def _pack(values, cell_bits):
+    values = bytes(values)
+    if cell_bits == 8:
+        return values
+    if len(values) % 2:
+        values += b"\0"
+    return bytes(high << 4 | low for high, low in zip(values[0::2],values[1::2]))
+
+_HIGH = bytes(byte >> 4 for byte in range(256))
+_LOW = bytes(byte & 15 for byte in range(256))
+
+#two translations of the packed bytes, interleaved
+def _unpack(data, cells, cell_bits):
+    if cell_bits == 8:
+        return bytearray(data)
+    values = bytearray(2*len(data))
+    values[0::2] = data.translate(_HIGH)
+    values[1::2] = data.translate(_LOW)
+    del values[cells:]
+    return values
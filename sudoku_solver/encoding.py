@@ -0,0 +1,64 @@
+from array import array
+
+#one sudoku per line, size*size characters row by row, "." or "0" for an empty cell
+#numbers above 9 are written as letters, A for 10 up to Z for 35
+BLANKS = ".0"
+DIGITS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def field_to_string(field):
+    return "".join(_cell_to_char(cell) for row in field for cell in row)
+
+def _cell_to_char(cell):
+    if cell == "":
+        return "."
+    try:
+        number = int(cell)
+    except (ValueError,TypeError):
+        number = 0
+    if not 1 <= number <= len(DIGITS):
+        raise ValueError("Invalid cell {!r}, expected a number from 1 to {}".format(cell,len(DIGITS)))
+    return DIGITS[number-1]
+
+def field_from_string(text):
+    text = text.strip()
+    size = int(len(text)**0.5)
+    if size*size != len(text) or size == 0:
+        raise ValueError("Expected a square number of cells, got {}".format(len(text)))
+    field = []
+    for row in range(size):
+        cells = []
+        for char in text[row*size:row*size+size]:
+            if char in BLANKS:
+                cells.append("")
+            elif char.upper() in DIGITS[:size]:
+                cells.append(DIGITS.index(char.upper())+1)
+            else:
+                raise ValueError("Invalid cell {!r} for a {}x{} sudoku".format(char,size,size))
+        field.append(cells)
+    return field
+
+#every byte mapped to its number, blanks to 0 and anything else to _INVALID
+def _build_numbers():
+    numbers = bytearray([_INVALID]*256)
+    for char in BLANKS:
+        numbers[ord(char)] = 0
+    for number, char in enumerate(DIGITS):
+        numbers[ord(char)] = numbers[ord(char.lower())] = number+1
+    return bytes(numbers)
+
+_INVALID = 255
+_NUMBERS = _build_numbers()
+
+#the numbers of the cells in one pass over ascii bytes, without building a field
+def values_from_bytes(data):
+    values = array("B",bytes(data).translate(_NUMBERS))
+    if _INVALID in values:
+        char = bytes(data)[values.index(_INVALID)]
+        raise ValueError("Invalid cell {!r}".format(chr(char)))
+    return values
+
+#the position of the first byte that isn't a cell, None if there is none
+def _invalid_index(data):
+    index = bytes(data).translate(_NUMBERS).find(_INVALID)
+    return None if index < 0 else index
@@ -0,0 +1,147 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from .solver import SudokuSolver, SolveResult, get_layout, get_default_square_size
+
+#from easiest to hardest: the hardest rule needed to solve a sudoku, or search when the rules get stuck
+DIFFICULTIES = ("singles","pointers","subsets","advanced","search")
+#the rules of every difficulty after singles
+DIFFICULTY_TECHNIQUES = {"pointers":("pointers",),"subsets":("subsets",),
+                         "advanced":("x_wing","xy_wing","xyz_wing")+SudokuSolver.EXTRA_TECHNIQUES}
+#clues are removed together with their mirror images: none, around the centre, left to right, across the diagonal
+SYMMETRIES = ("none","rotational","mirror","diagonal")
+#full grids tried when the clues can't be removed down to the wanted difficulty
+MAX_ATTEMPTS = 50
+
+
+class GeneratedPuzzle:
+
+    __slots__ = ("field","solution","difficulty","seed")
+
+    def __init__(self, field, solution, difficulty, seed):
+        self.field = field
+        self.solution = solution
+        self.difficulty = difficulty
+        self.seed = seed
+
+    @property
+    def clues(self):
+        return sum(cell != "" for row in self.field for cell in row)
+
+    def __repr__(self):
+        return "GeneratedPuzzle(difficulty={!r}, clues={}, seed={!r})".format(self.difficulty,self.clues,self.seed)
+
+
+#the hardest rule the solver needed, one of DIFFICULTIES; the rules run cheapest first and start over
+#after every deduction, so a rule that deduced anything was needed
+def grade(field, square_height = None, square_width = None):
+    solver = SudokuSolver(field,square_height=square_height,square_width=square_width,collect_stats=True)
+    difficulty = _grade(solver)
+    if difficulty is None:
+        raise ValueError("The sudoku has no solution")
+    return difficulty
+
+#a unique sudoku made from a random full grid by removing clues as long as the solution stays unique
+#and, with a difficulty, the sudoku doesn't get harder than it; the same seed gives the same sudoku
+def generate(difficulty = None, symmetry = "rotational", seed = None, size = 9, square_height = None, square_width = None,
+             max_attempts = MAX_ATTEMPTS):
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise ValueError("Unknown difficulty {!r}, expected one of {}".format(difficulty,DIFFICULTIES))
+    if symmetry not in SYMMETRIES:
+        raise ValueError("Unknown symmetry {!r}, expected one of {}".format(symmetry,SYMMETRIES))
+    if square_height is None or square_width is None:
+        square_height, square_width = get_default_square_size(size)
+    layout = get_layout(square_height,square_width)
+    rng = random.Random(seed)
+    for attempt in range(max_attempts):
+        solution = _full_grid(layout,rng)
+        values, reached = _remove_clues(solution,layout,rng,symmetry,difficulty)
+        if difficulty is None or reached == difficulty:
+            return GeneratedPuzzle(_to_field(values,layout.size),_to_field(solution,layout.size),reached,seed)
+    raise RuntimeError("No {} sudoku found in {} attempts".format(difficulty,max_attempts))
+
+#generates count sudokus on a process pool, in order; sudoku i uses the seed seed+i
+#workers=0 generates in the calling process
+def generate_many(count, difficulty = None, symmetry = "rotational", seed = None, size = 9, square_height = None,
+                  square_width = None, workers = None):
+    if seed is None:
+        seed = random.randrange(1 << 32)
+    options = (difficulty,symmetry,size,square_height,square_width)
+    seeds = range(seed,seed+count)
+    if workers == 0:
+        for puzzle_seed in seeds:
+            yield _generate_with(puzzle_seed,options)
+        return
+    with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+        yield from executor.map(_generate_with,seeds,[options]*count)
+
+def _generate_with(seed, options):
+    difficulty, symmetry, size, square_height, square_width = options
+    return generate(difficulty,symmetry,seed,size,square_height,square_width)
+
+#random numbers in the squares on the diagonal, which don't see each other, completed by the solver
+#on small boards not every such start can be completed, then it is drawn again
+def _full_grid(layout, rng):
+    while True:
+        values = [0]*layout.cells
+        for number in range(min(layout.square_height,layout.square_width)):
+            square = layout.squares[number*layout.square_height+number]
+            for cell, value in zip(square,rng.sample(range(1,layout.size+1),layout.size)):
+                values[cell] = value
+        result = SudokuSolver.from_array(values,square_height=layout.square_height,square_width=layout.square_width).solve()
+        if result.solved:
+            return [cell for row in result.field for cell in row]
+
+def _remove_clues(solution, layout, rng, symmetry, difficulty):
+    values = list(solution)
+    reached = DIFFICULTIES[0]
+    orbits = _orbits(layout.size,symmetry)
+    rng.shuffle(orbits)
+    for orbit in orbits:
+        for cell in orbit:
+            values[cell] = 0
+        solver = SudokuSolver.from_array(values,square_height=layout.square_height,square_width=layout.square_width,
+                                         collect_stats=True)
+        graded = _grade(solver)
+        if graded == "search" and difficulty in (None,"search") and not solver.is_unique():
+            graded = None
+        if graded is None or difficulty is not None and DIFFICULTIES.index(graded) > DIFFICULTIES.index(difficulty):
+            for cell in orbit:
+                values[cell] = solution[cell]
+        else:
+            reached = graded
+    return values, reached
+
+#None when the sudoku has no solution; search doesn't tell whether the solution is unique
+def _grade(solver):
+    result = solver.solve(search=False,techniques=SudokuSolver.TECHNIQUES+SudokuSolver.EXTRA_TECHNIQUES)
+    if result.status == SolveResult.CONTRADICTION:
+        return None
+    if not result.solved:
+        return "search"
+    for difficulty in ("advanced","subsets","pointers"):
+        for name in DIFFICULTY_TECHNIQUES[difficulty]:
+            stats = solver.stats.techniques.get(name)
+            if stats is not None and (stats.eliminated or stats.placed):
+                return difficulty
+    return "singles"
+
+#the groups of cells that are emptied together to keep the pattern symmetric
+def _orbits(size, symmetry):
+    orbits = {}
+    for row in range(size):
+        for col in range(size):
+            if symmetry == "rotational":
+                cells = {row*size+col,(size-1-row)*size+size-1-col}
+            elif symmetry == "mirror":
+                cells = {row*size+col,row*size+size-1-col}
+            elif symmetry == "diagonal":
+                cells = {row*size+col,col*size+row}
+            else:
+                cells = {row*size+col}
+            orbits[min(cells)] = sorted(cells)
+    return [orbits[first] for first in sorted(orbits)]
+
+def _to_field(values, size):
+    return [[value or "" for value in values[row*size:row*size+size]] for row in range(size)]
@@ -0,0 +1,32 @@
+#one puzzle per line in the format of encoding.py, e.g. 81 characters with "." or "0" for empty cells
+#empty lines and lines starting with "#" are skipped
+
+LINES_PER_WRITE = 4096
+
+
+#yields the puzzles one by one, so the file is never held in memory
+def read_puzzles(file):
+    for line in file:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        yield line
+
+#writes one line per result: the solution, or the grid reached (or the puzzle) followed by the status
+def write_results(results, file, lines_per_write = LINES_PER_WRITE):
+    lines = []
+    solved = 0
+    total = 0
+    for result in results:
+        total += 1
+        if result.solved:
+            solved += 1
+            lines.append(result.grid+"\n")
+        else:
+            lines.append("{} {}\n".format(result.grid or result.puzzle,result.status))
+        if len(lines) == lines_per_write:
+            file.write("".join(lines))
+            lines = []
+    if lines:
+        file.write("".join(lines))
+    return solved, total
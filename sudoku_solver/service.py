@@ -0,0 +1,256 @@
+import asyncio
+import collections
+import json
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .batch import BatchResult, _solve_chunk
+from .encoding import field_to_string
+
+#requests waiting for or holding a worker, per worker, before new ones are rejected
+PENDING_PER_WORKER = 4
+#seconds past its timeout a worker gets to stop the solver by itself before it is killed
+KILL_AFTER = 0.5
+#latencies kept for the percentiles of metrics()
+LATENCY_WINDOW = 1000
+#largest request body the http endpoint reads
+MAX_BODY = 65536
+#replacement workers are started while the threads of AsyncSolver wait on the other pipes, and forking a process
+#with threads can copy locks that are held, so workers start as fresh interpreters
+_CONTEXT = multiprocessing.get_context("spawn")
+
+
+class ServiceOverloadedError(RuntimeError):
+    pass
+
+
+#solves sudokus for asyncio code on worker processes, one sudoku per worker at a time
+#at most max_pending requests are accepted at once, more raise ServiceOverloadedError right away
+#a request that runs past its timeout, or whose task is cancelled, has its worker killed and replaced,
+#so a sudoku that never finishes can't block a worker
+class AsyncSolver:
+
+    TIMEOUT = "timeout"
+
+    def __init__(self, workers = None, max_pending = None, timeout = None, engine = None, techniques = None):
+        self.workers = workers or os.cpu_count()
+        self.max_pending = max_pending or self.workers*PENDING_PER_WORKER
+        self.timeout = timeout
+        self.engine = engine
+        self.techniques = techniques
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self._requests = 0
+        self._queued = 0
+        self._in_flight = 0
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._closed = False
+        self._threads = ThreadPoolExecutor(self.workers)
+        self._all_workers = set()
+        self._idle = asyncio.Queue()
+        for number in range(self.workers):
+            self._idle.put_nowait(self._start_worker())
+
+    #puzzle is a nested list or a string in the format of encoding.py, timeout in seconds overrides the default one
+    #returns a BatchResult whose status is AsyncSolver.TIMEOUT when the worker had to be killed
+    async def solve(self, puzzle, timeout = None):
+        if self._closed:
+            raise RuntimeError("The solver is closed")
+        if self._queued+self._in_flight >= self.max_pending:
+            self.rejected += 1
+            raise ServiceOverloadedError("{} requests are already pending".format(self._queued+self._in_flight))
+        if not isinstance(puzzle,str):
+            puzzle = field_to_string(puzzle)
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is not None and (not isinstance(timeout,(int,float)) or timeout <= 0):
+            raise ValueError("Expected a positive timeout, got {!r}".format(timeout))
+        options = (self.engine,None,None,timeout,False,self.techniques)
+        index = self._requests
+        self._requests += 1
+        started = time.perf_counter()
+        self._queued += 1
+        try:
+            worker = await self._idle.get()
+        finally:
+            self._queued -= 1
+        if worker is None:
+            self._idle.put_nowait(None)
+            raise RuntimeError("The solver is closed")
+        self._in_flight += 1
+        future = asyncio.get_running_loop().run_in_executor(self._threads,worker.solve,puzzle,options,
+                                                             None if timeout is None else timeout+KILL_AFTER)
+        try:
+            outcome = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            worker.kill()
+            future.add_done_callback(lambda done: self._release(worker))
+            raise
+        else:
+            self._release(worker)
+        finally:
+            self._in_flight -= 1
+        if outcome is None:
+            self.timeouts += 1
+            outcome = (AsyncSolver.TIMEOUT,None,"No result after {} seconds, the worker was restarted".format(timeout),None)
+        self.completed += 1
+        self._latencies.append(time.perf_counter()-started)
+        status, grid, error, stats = outcome
+        return BatchResult(index,puzzle,status,grid,error)
+
+    #queue depth, worker restarts and request latencies in seconds over the last LATENCY_WINDOW requests
+    def metrics(self):
+        latencies = sorted(self._latencies)
+        return {"workers":self.workers,"max_pending":self.max_pending,"queued":self._queued,"in_flight":self._in_flight,
+                "completed":self.completed,"rejected":self.rejected,"timeouts":self.timeouts,"restarts":self.restarts,
+                "latency_mean":sum(latencies)/len(latencies) if latencies else 0.0,
+                "latency_p50":_percentile(latencies,0.5),"latency_p95":_percentile(latencies,0.95),
+                "latency_max":latencies[-1] if latencies else 0.0}
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        #wakes the requests waiting for a worker, each puts it back for the next one
+        self._idle.put_nowait(None)
+        for worker in list(self._all_workers):
+            worker.kill()
+        await asyncio.get_running_loop().run_in_executor(None,self._threads.shutdown)
+        for worker in list(self._all_workers):
+            self._close_worker(worker)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _start_worker(self):
+        worker = _Worker()
+        self._all_workers.add(worker)
+        return worker
+
+    def _close_worker(self, worker):
+        worker.close()
+        self._all_workers.discard(worker)
+
+    #gives a worker back, a killed one is replaced by a new process
+    def _release(self, worker):
+        if self._closed:
+            self._close_worker(worker)
+            return
+        if worker.broken:
+            self._close_worker(worker)
+            worker = self._start_worker()
+            self.restarts += 1
+        self._idle.put_nowait(worker)
+
+    def __repr__(self):
+        return "AsyncSolver(workers={}, queued={}, in_flight={}, completed={})".format(self.workers,self._queued,self._in_flight,
+                                                                                     self.completed)
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered)-1,int(fraction*len(ordered)))]
+
+
+#a worker process and the pipe to it, solve() blocks and runs in a thread of AsyncSolver
+class _Worker:
+
+    def __init__(self):
+        self._connection, child = _CONTEXT.Pipe()
+        self.process = _CONTEXT.Process(target=_serve_worker,args=(child,),daemon=True)
+        self.process.start()
+        child.close()
+        self.broken = False
+
+    #the outcome tuple of batch._solve_chunk, None when there was no result within timeout seconds
+    def solve(self, puzzle, options, timeout):
+        try:
+            self._connection.send((puzzle,options))
+            if self._connection.poll(timeout):
+                return self._connection.recv()
+        except (EOFError,OSError):
+            self.broken = True
+            return BatchResult.ERROR, None, "The worker process died", None
+        self.kill()
+        return None
+
+    def kill(self):
+        self.broken = True
+        self.process.kill()
+
+    def close(self):
+        self.process.kill()
+        self.process.join()
+        self._connection.close()
+
+
+def _serve_worker(connection):
+    signal.signal(signal.SIGINT,signal.SIG_IGN)
+    while True:
+        try:
+            puzzle, options = connection.recv()
+        except EOFError:
+            return
+        connection.send(_solve_chunk([puzzle],options)[0])
+
+
+#a small http/json front end for local testing, returns the asyncio server
+#POST /solve with {"puzzle": ..., "timeout": ...} answers {"status": ..., "grid": ..., "error": ...}, or 503 when
+#the solver is overloaded; GET /metrics answers AsyncSolver.metrics()
+async def serve_http(solver, host = "127.0.0.1", port = 8080):
+    return await asyncio.start_server(lambda reader, writer: _handle_http(solver,reader,writer),host,port)
+
+async def _handle_http(solver, reader, writer):
+    try:
+        try:
+            method, path, headers, body = await _read_request(reader)
+            code, payload = await _route(solver,method,path,body)
+        except (ValueError,TypeError,asyncio.IncompleteReadError) as error:
+            code, payload = 400, {"error":str(error) or "Bad request"}
+        data = json.dumps(payload).encode("utf-8")
+        writer.write("HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\nConnection: close\r\n\r\n".format(
+            code,_REASONS[code],len(data)).encode("latin-1")+data)
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+_REASONS = {200:"OK",400:"Bad Request",404:"Not Found",503:"Service Unavailable"}
+
+async def _read_request(reader):
+    method, path, version = (await reader.readline()).decode("latin-1").split(" ",2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n",b"\n",b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length",0))
+    if length > MAX_BODY:
+        raise ValueError("The body is larger than {} bytes".format(MAX_BODY))
+    return method, path, headers, await reader.readexactly(length)
+
+async def _route(solver, method, path, body):
+    if method == "GET" and path == "/metrics":
+        return 200, solver.metrics()
+    if method != "POST" or path != "/solve":
+        return 404, {"error":"Not found"}
+    request = json.loads(body)
+    if not isinstance(request,dict) or "puzzle" not in request:
+        raise ValueError("Expected a json object with a puzzle")
+    try:
+        result = await solver.solve(request["puzzle"],request.get("timeout"))
+    except ServiceOverloadedError as error:
+        return 503, {"error":str(error)}
+    return 200, {"status":result.status,"grid":result.grid,"error":result.error}
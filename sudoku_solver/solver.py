@@ -0,0 +1,1432 @@
+import collections
+import itertools
+import copy
+import time
+from array import array
+
+from .encoding import values_from_bytes, _invalid_index
+
+class SudokuSolver:
+
+    __slots__ = ("_engine","_pipeline","_rounds","_technique_calls","_max_rounds","_max_technique_calls","_deadline",
+                 "_solutions_found","_prepared","_edits","stats")
+
+    ALL_NUMBERS = {1,2,3,4,5,6,7,8,9}
+    ENGINES = ("bitmask","sets")
+    #cheapest first, the default pipeline; the sets engine only has the first four
+    TECHNIQUES = ("naked_singles","hidden_singles","pointers","subsets","x_wing","xy_wing","xyz_wing")
+    #rules that rarely pay for themselves when the search follows, for solving without it or grading
+    EXTRA_TECHNIQUES = ("swordfish","simple_coloring","jellyfish")
+
+    #the squares default to the most square shape that fits the board, e.g. 2x3 for a 6x6 sudoku
+    #with collect_stats the time, calls and deductions of every technique are added up in self.stats
+    #raises InvalidSudokuError for fields that aren't size x size, numbers out of range or a number twice in a unit
+    def __init__(self, field, engine = "bitmask", square_height = None, square_width = None, collect_stats = False):
+        self._setup(_values_from_field(field),len(field),engine,square_height,square_width,collect_stats)
+
+    #a string of size*size cells as written by field_to_string, "." or "0" for an empty cell
+    @staticmethod
+    def from_string(text, engine = "bitmask", square_height = None, square_width = None, collect_stats = False):
+        return SudokuSolver.from_bytes(text.strip().encode("ascii","replace"),engine,square_height,square_width,collect_stats)
+
+    #the same as from_string, for ascii bytes
+    @staticmethod
+    def from_bytes(data, engine = "bitmask", square_height = None, square_width = None, collect_stats = False):
+        try:
+            values = values_from_bytes(data)
+        except ValueError as error:
+            index = _invalid_index(data)
+            size = int(len(data)**0.5)
+            if size*size != len(data) or index is None:
+                raise InvalidSudokuError(str(error))
+            raise InvalidSudokuError("{} at row {}, col {}".format(error,index//size,index%size),[(index//size,index%size)])
+        return SudokuSolver._create(values,engine,square_height,square_width,collect_stats)
+
+    #a flat sequence of size*size numbers, 0 for an empty cell, e.g. a list, an array or a row of a numpy array
+    @staticmethod
+    def from_array(values, engine = "bitmask", square_height = None, square_width = None, collect_stats = False):
+        try:
+            values = array("B",values)
+        except (OverflowError,TypeError) as error:
+            raise InvalidSudokuError("Expected numbers from 0 to the size of the sudoku: {}".format(error))
+        return SudokuSolver._create(values,engine,square_height,square_width,collect_stats)
+
+    @staticmethod
+    def _create(values, engine, square_height, square_width, collect_stats):
+        size = int(len(values)**0.5)
+        if size*size != len(values) or size == 0:
+            raise InvalidSudokuError("Expected a square number of cells, got {}".format(len(values)))
+        if max(values) > size:
+            index = values.index(max(values))
+            raise InvalidSudokuError("Expected numbers from 0 to {} for a {}x{} sudoku, got {}".format(size,size,size,max(values)),
+                                     [(index//size,index%size)])
+        solver = SudokuSolver.__new__(SudokuSolver)
+        solver._setup(values,size,engine,square_height,square_width,collect_stats)
+        return solver
+
+    def _setup(self, values, size, engine, square_height, square_width, collect_stats):
+        if size == 0:
+            raise InvalidSudokuError("Expected at least one row, got an empty field")
+        if square_height is None or square_width is None:
+            square_height, square_width = get_default_square_size(size)
+        if square_height*square_width != size:
+            raise InvalidSudokuError("Squares of {}x{} don't fit a board of {} rows".format(square_height,square_width,size))
+        if engine not in SudokuSolver.ENGINES:
+            raise ValueError("Unknown engine {!r}, expected one of {}".format(engine,SudokuSolver.ENGINES))
+        if engine == "sets" and (square_height,square_width) != (3,3):
+            raise ValueError("The sets engine only supports 9x9 sudokus with 3x3 squares")
+        layout = get_layout(square_height,square_width)
+        _check_units(values,layout)
+        if engine == "sets":
+            self._engine = _SetEngine(values)
+        else:
+            self._engine = _BitmaskEngine(values,layout)
+        self._rounds = 0
+        self._technique_calls = 0
+        self._prepared = False
+        self._edits = []
+        self.stats = SolverStats() if collect_stats else None
+
+    def solve_sudoku(self, techniques = None):
+        result = self.solve(techniques=techniques)
+        if not result.solved:
+            raise ValueError("The sudoku has no solution")
+        return result.field
+
+    #solves within the given limits; time_limit is in seconds
+    #techniques are the names of the rules to apply, in the order to try them; by default TECHNIQUES
+    def solve(self, max_rounds = None, max_technique_calls = None, time_limit = None, search = True, techniques = None):
+        self._start(max_rounds,max_technique_calls,time_limit,techniques)
+        engine = self._engine
+        try:
+            self._propagate()
+            if engine.has_contradiction():
+                status = SolveResult.CONTRADICTION
+            elif engine.is_solved():
+                status = SolveResult.SOLVED
+            elif not search:
+                status = SolveResult.STALLED
+            else:
+                status = self._search_keeping_deductions()
+        except _BudgetExceeded:
+            status = SolveResult.BUDGET_EXCEEDED
+        self._record_run()
+        return SolveResult(status,engine.get_field(),engine.get_markers(),self._rounds,self._technique_calls)
+
+    #searches every branch until limit solutions are found, the deductions of the rules are shared by the branches
+    def count_solutions(self, limit = 2, max_technique_calls = None, time_limit = None, techniques = None):
+        if limit < 1:
+            raise ValueError("The limit has to be at least 1, got {}".format(limit))
+        self._start(None,max_technique_calls,time_limit,techniques)
+        self._solutions_found = 0
+        solutions = []
+        try:
+            self._propagate()
+            #a search stopped by the budget goes back to the deductions, like solve() does
+            state = self._engine.snapshot()
+            try:
+                self._count_solutions(limit,solutions)
+            except _BudgetExceeded:
+                self._engine.restore(state)
+                raise
+            status = SolutionCount.LIMIT_REACHED if self._solutions_found == limit else SolutionCount.COMPLETE
+        except _BudgetExceeded:
+            status = SolveResult.BUDGET_EXCEEDED
+        self._record_run()
+        return SolutionCount(status,self._solutions_found,solutions)
+
+    #exactly one solution
+    def is_unique(self, techniques = None):
+        return self.count_solutions(2,techniques=techniques).unique
+
+    #the next deduction as a Step: the first rule, cheapest first, that changes anything is applied up to its first
+    #deduction, a single number placed or the markers removed by one pattern
+    #None when the sudoku is solved, contradicts itself or the rules are stuck
+    #the markers are only prepared by the first call, later calls go on from the deductions made so far
+    def next_step(self, techniques = None):
+        if self._prepared:
+            self._pipeline = self._build_pipeline(techniques)
+        else:
+            self._start(None,None,None,techniques)
+        engine = self._engine
+        for name, technique in self._pipeline:
+            if engine.is_solved() or engine.has_contradiction():
+                return None
+            field = engine.get_field()
+            markers = engine.get_markers()
+            version = engine.version()
+            engine.set_single_step(True)
+            try:
+                if self.stats is None:
+                    technique()
+                else:
+                    self._run_measured(name,technique)
+            finally:
+                engine.set_single_step(False)
+            self._technique_calls += 1
+            if engine.version() != version:
+                return Step.between(name,field,markers,engine.get_field(),engine.get_markers())
+        return None
+
+    #the steps of the rules until they stop, see next_step()
+    def iter_steps(self, techniques = None):
+        while True:
+            step = self.next_step(techniques)
+            if step is None:
+                return
+            yield step
+
+    #fills in a number like a player does, only the markers of the peers change and the deductions made so far are kept
+    #raises InvalidSudokuError when a peer already holds the number and ValueError when the cell isn't empty
+    def place(self, row, col, digit):
+        engine = self._engine
+        size = self._check_cell(row,col)
+        if not isinstance(digit,int) or not 1 <= digit <= size:
+            raise InvalidSudokuError("Expected a number from 1 to {}, got {!r}".format(size,digit),[(row,col)])
+        conflicts = engine.find_peers_with(row,col,digit)
+        if conflicts:
+            raise InvalidSudokuError("{} is already in the row, col or square of row {}, col {}".format(digit,row,col),
+                                     [(row,col)]+conflicts)
+        value = engine.get_value(row,col)
+        if value != 0:
+            raise ValueError("Row {}, col {} already holds {}".format(row,col,value))
+        if not self._prepared:
+            engine.prepare()
+            self._prepared = True
+        #the state before every edit, erase() goes back to it
+        self._edits.append((row,col,digit,engine.snapshot()))
+        engine.place(row,col,digit)
+
+    #takes back a number filled in with place(), the state from before it is restored and the later edits placed again
+    #raises ValueError for clues and numbers filled in by the rules
+    def erase(self, row, col):
+        self._check_cell(row,col)
+        value = self._engine.get_value(row,col)
+        for position in range(len(self._edits)):
+            if self._edits[position][:3] == (row,col,value):
+                break
+        else:
+            raise ValueError("Row {}, col {} wasn't filled in with place()".format(row,col))
+        later = self._edits[position+1:]
+        self._engine.restore(self._edits[position][3])
+        del self._edits[position:]
+        for edit_row, edit_col, digit, state in later:
+            self._edits.append((edit_row,edit_col,digit,self._engine.snapshot()))
+            self._engine.place(edit_row,edit_col,digit)
+
+    #whether the sudoku as it stands, with the numbers filled in, can be solved; the sudoku isn't changed
+    def is_solvable(self, techniques = None):
+        state = self._engine.snapshot()
+        prepared = self._prepared
+        try:
+            return self.solve(techniques=techniques).solved
+        finally:
+            self._engine.restore(state)
+            self._prepared = prepared
+
+    def _check_cell(self, row, col):
+        size = self._engine.get_size()
+        if not (isinstance(row,int) and isinstance(col,int) and 0 <= row < size and 0 <= col < size):
+            raise ValueError("Expected a row and col from 0 to {}, got {!r}, {!r}".format(size-1,row,col))
+        return size
+
+    def _start(self, max_rounds, max_technique_calls, time_limit, techniques):
+        self._pipeline = self._build_pipeline(techniques)
+        self._rounds = 0
+        self._technique_calls = 0
+        self._max_rounds = max_rounds
+        self._max_technique_calls = max_technique_calls
+        self._deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self._engine.prepare()
+        self._prepared = True
+
+    def _record_run(self):
+        if self.stats is not None:
+            self.stats.solves += 1
+            self.stats.rounds += self._rounds
+
+    #by default the TECHNIQUES the engine has
+    def _build_pipeline(self, techniques):
+        available = self._engine.get_techniques()
+        if techniques is None:
+            techniques = [name for name in SudokuSolver.TECHNIQUES if name in available]
+        pipeline = []
+        for name in techniques:
+            if name in SudokuSolver.TECHNIQUES+SudokuSolver.EXTRA_TECHNIQUES and name not in available:
+                raise ValueError("The sets engine doesn't have the technique {!r}".format(name))
+            if name not in available:
+                raise ValueError("Unknown technique {!r}, expected some of {}".format(name,
+                                                                                     SudokuSolver.TECHNIQUES+SudokuSolver.EXTRA_TECHNIQUES))
+            pipeline.append((name,available[name]))
+        return pipeline
+
+    #applies the rules until the sudoku is solved, contradicts itself or none of them changes anything
+    #as soon as a rule makes progress the next round starts again from the first, cheapest one
+    def _propagate(self):
+        engine = self._engine
+        pipeline = self._pipeline
+        while not engine.is_solved() and not engine.has_contradiction():
+            if self._max_rounds is not None and self._rounds >= self._max_rounds:
+                raise _BudgetExceeded()
+            self._rounds += 1
+            for name, technique in pipeline:
+                self._check_budget()
+                version = engine.version()
+                if self.stats is None:
+                    technique()
+                else:
+                    self._run_measured(name,technique)
+                self._technique_calls += 1
+                if engine.version() != version:
+                    break
+            else:
+                return
+
+    def _run_measured(self, name, technique):
+        engine = self._engine
+        markers = engine.count_markers()
+        empty_cells = engine.count_empty_cells()
+        start = time.perf_counter()
+        technique()
+        seconds = time.perf_counter()-start
+        placed = empty_cells-engine.count_empty_cells()
+        self.stats.record(name,seconds,markers-engine.count_markers()-placed,placed)
+
+    def _check_budget(self):
+        if self._max_technique_calls is not None and self._technique_calls >= self._max_technique_calls:
+            raise _BudgetExceeded()
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _BudgetExceeded()
+
+    #on an exceeded budget the guesses are undone, so only the deductions are reported
+    def _search_keeping_deductions(self):
+        state = self._engine.snapshot()
+        try:
+            if self._search():
+                return SolveResult.SOLVED
+            self._engine.restore(state)
+            return SolveResult.CONTRADICTION
+        except _BudgetExceeded:
+            self._engine.restore(state)
+            raise
+
+    #guesses the markers of the cell with the fewest ones, propagating after every guess
+    def _search(self):
+        engine = self._engine
+        if engine.has_contradiction():
+            return False
+        if engine.is_solved():
+            return True
+        row, col, digits = engine.choose_branch_cell()
+        state = engine.snapshot()
+        for digit in digits:
+            if self.stats is not None:
+                self.stats.guesses += 1
+            engine.place(row,col,digit)
+            self._propagate()
+            if self._search():
+                return True
+            engine.restore(state)
+        return False
+
+    #like _search, but goes on after a solution; keeps the first two solutions for telling them apart
+    def _count_solutions(self, limit, solutions):
+        engine = self._engine
+        if engine.has_contradiction():
+            return
+        if engine.is_solved():
+            self._solutions_found += 1
+            if len(solutions) < 2:
+                solutions.append(engine.get_field())
+            return
+        row, col, digits = engine.choose_branch_cell()
+        state = engine.snapshot()
+        for digit in digits:
+            if self.stats is not None:
+                self.stats.guesses += 1
+            engine.place(row,col,digit)
+            self._propagate()
+            self._count_solutions(limit,solutions)
+            engine.restore(state)
+            if self._solutions_found == limit:
+                return
+
+
+class SolveResult:
+
+    __slots__ = ("status","field","markers","rounds","technique_calls")
+
+    SOLVED = "solved"
+    STALLED = "stalled"
+    CONTRADICTION = "contradiction"
+    BUDGET_EXCEEDED = "budget-exceeded"
+
+    def __init__(self, status, field, markers, rounds, technique_calls):
+        self.status = status
+        self.field = field
+        self.markers = markers
+        self.rounds = rounds
+        self.technique_calls = technique_calls
+
+    @property
+    def solved(self):
+        return self.status == SolveResult.SOLVED
+
+    def __repr__(self):
+        return "SolveResult(status={!r}, rounds={}, technique_calls={})".format(self.status,self.rounds,self.technique_calls)
+
+
+#one application of a rule: placed and eliminated are lists of (row, col, number), for the numbers filled in
+#and the markers removed from the cells that stay empty
+class Step:
+
+    __slots__ = ("technique","placed","eliminated")
+
+    def __init__(self, technique, placed, eliminated):
+        self.technique = technique
+        self.placed = placed
+        self.eliminated = eliminated
+
+    #the differences between two fields and their markers
+    @staticmethod
+    def between(technique, field, markers, new_field, new_markers):
+        placed = []
+        eliminated = []
+        for row in range(len(field)):
+            for col in range(len(field)):
+                if new_field[row][col] != field[row][col]:
+                    placed.append((row,col,new_field[row][col]))
+                    continue
+                for number in sorted(markers[row][col]-new_markers[row][col]):
+                    eliminated.append((row,col,number))
+        return Step(technique,placed,eliminated)
+
+    #the (row, col) of every cell the step changed
+    @property
+    def cells(self):
+        return sorted({(row,col) for row, col, number in self.placed+self.eliminated})
+
+    def __repr__(self):
+        return "Step(technique={!r}, placed={}, eliminated={})".format(self.technique,self.placed,self.eliminated)
+
+
+#status is COMPLETE when every branch was searched, so count is the number of solutions,
+#LIMIT_REACHED when the search stopped at the limit, or SolveResult.BUDGET_EXCEEDED
+#solutions holds the first two solutions found
+class SolutionCount:
+
+    __slots__ = ("status","count","solutions")
+
+    COMPLETE = "complete"
+    LIMIT_REACHED = "limit-reached"
+
+    def __init__(self, status, count, solutions):
+        self.status = status
+        self.count = count
+        self.solutions = solutions
+
+    @property
+    def unique(self):
+        return self.status == SolutionCount.COMPLETE and self.count == 1
+
+    def __repr__(self):
+        return "SolutionCount(status={!r}, count={})".format(self.status,self.count)
+
+
+class TechniqueStats:
+
+    __slots__ = ("calls","seconds","eliminated","placed")
+
+    def __init__(self, calls = 0, seconds = 0.0, eliminated = 0, placed = 0):
+        self.calls = calls
+        self.seconds = seconds
+        self.eliminated = eliminated
+        self.placed = placed
+
+    def __repr__(self):
+        return "TechniqueStats(calls={}, seconds={:.6f}, eliminated={}, placed={})".format(self.calls,self.seconds,self.eliminated,self.placed)
+
+
+#per technique: calls, seconds spent, markers eliminated and cells placed; merge() adds up the stats of other solvers
+class SolverStats:
+
+    __slots__ = ("solves","rounds","guesses","techniques")
+
+    def __init__(self):
+        self.solves = 0
+        self.rounds = 0
+        self.guesses = 0
+        self.techniques = {}
+
+    def record(self, name, seconds, eliminated, placed):
+        if name not in self.techniques:
+            self.techniques[name] = TechniqueStats()
+        technique = self.techniques[name]
+        technique.calls += 1
+        technique.seconds += seconds
+        technique.eliminated += eliminated
+        technique.placed += placed
+
+    def merge(self, other):
+        self.solves += other.solves
+        self.rounds += other.rounds
+        self.guesses += other.guesses
+        for name, technique in other.techniques.items():
+            if name not in self.techniques:
+                self.techniques[name] = TechniqueStats()
+            total = self.techniques[name]
+            total.calls += technique.calls
+            total.seconds += technique.seconds
+            total.eliminated += technique.eliminated
+            total.placed += technique.placed
+        return self
+
+    def to_dict(self):
+        return {"solves":self.solves,"rounds":self.rounds,"guesses":self.guesses,
+                "techniques":{name:[technique.calls,technique.seconds,technique.eliminated,technique.placed]
+                              for name, technique in self.techniques.items()}}
+
+    @staticmethod
+    def from_dict(data):
+        stats = SolverStats()
+        stats.solves = data["solves"]
+        stats.rounds = data["rounds"]
+        stats.guesses = data["guesses"]
+        stats.techniques = {name:TechniqueStats(*values) for name, values in data["techniques"].items()}
+        return stats
+
+    def format(self):
+        lines = ["{} solves, {} rounds, {} guesses".format(self.solves,self.rounds,self.guesses),
+                 "{:<16}{:>10}{:>12}{:>12}{:>10}".format("technique","calls","seconds","eliminated","placed")]
+        for name, technique in self.techniques.items():
+            lines.append("{:<16}{:>10}{:>12.4f}{:>12}{:>10}".format(name,technique.calls,technique.seconds,technique.eliminated,technique.placed))
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return "SolverStats(solves={}, rounds={}, guesses={}, techniques={})".format(self.solves,self.rounds,self.guesses,self.techniques)
+
+
+#a sudoku that can't be solved as given; cells holds the (row, col) of the offending cells when known
+class InvalidSudokuError(ValueError):
+
+    def __init__(self, message, cells = ()):
+        super().__init__(message)
+        self.cells = list(cells)
+
+
+def _values_from_field(field):
+    size = len(field)
+    values = array("B")
+    for row, cells in enumerate(field):
+        if len(cells) != size:
+            raise InvalidSudokuError("Expected {} cells in every row, row {} has {}".format(size,row,len(cells)))
+        for col, cell in enumerate(cells):
+            if cell == "":
+                values.append(0)
+                continue
+            try:
+                number = int(cell)
+            except (TypeError,ValueError):
+                number = 0
+            if not 1 <= number <= size:
+                raise InvalidSudokuError("Invalid cell {!r} at row {}, col {} of a {}x{} sudoku".format(cell,row,col,size,size),
+                                         [(row,col)])
+            values.append(number)
+    return values
+
+#a number given twice in a row, col or square
+def _check_units(values, layout):
+    for number, unit in enumerate(layout.units):
+        seen = 0
+        for cell in unit:
+            if values[cell] == 0:
+                continue
+            bit = 1 << values[cell]
+            if seen & bit:
+                kind = ("row","col","square")[number // layout.size]
+                cells = [other for other in unit if values[other] == values[cell]]
+                raise InvalidSudokuError("{} is given twice in {} {}".format(values[cell],kind,number % layout.size),
+                                         [(other//layout.size,other%layout.size) for other in cells])
+            seen |= bit
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+#candidates kept as python sets, one per cell, rescanning the whole field every round
+#kept as the reference implementation of the original rules
+class _SetEngine:
+
+    __slots__ = ("_layout","_cells","_unit_sets","_markers","_empty_cells","_single")
+
+    def __init__(self, values):
+        self._layout = get_layout(3,3)
+        self._cells = ["" if value == 0 else value for value in values]
+        self._unit_sets = [set() for unit in self._layout.units]
+        self._markers = [set() for cell in self._cells]
+        self._empty_cells = self._cells.count("")
+        self._single = False
+
+    def prepare(self):
+        self._fill_initially_markers()
+        self._fill_sets()
+        self._fill_markers_from_sets()
+
+    def get_techniques(self):
+        return {"naked_singles":self._synced(self._populate_field),"hidden_singles":self._synced(self._find_only_markers),
+                "pointers":self._synced(self._fill_intersections),"subsets":self._synced(self._find_combinations)}
+
+    #the techniques expect the markers to be free of the numbers already placed
+    def _synced(self, technique):
+        def run():
+            self._fill_sets()
+            self._fill_markers_from_sets()
+            technique()
+        return run
+
+    #in single step mode a technique stops after its first deduction
+    def set_single_step(self, single):
+        self._single = single
+
+    #runs a part of a technique, tells whether the technique has to stop because it is in single step mode
+    #and the part changed something
+    def _stops(self, part, *args):
+        if not self._single:
+            part(*args)
+            return False
+        version = self.version()
+        part(*args)
+        return self.version() != version
+
+    def count_markers(self):
+        return sum(len(markers) for markers in self._markers)
+
+    def count_empty_cells(self):
+        return self._empty_cells
+
+    def is_solved(self):
+        return self._empty_cells == 0
+
+    def get_field(self):
+        return [self._cells[row*9:row*9+9] for row in range(9)]
+
+    def get_markers(self):
+        return [copy.deepcopy(self._markers[row*9:row*9+9]) for row in range(9)]
+
+    #changes whenever a cell or a marker changes, the rules only ever remove markers
+    def version(self):
+        return self._empty_cells, self.count_markers()
+
+    def snapshot(self):
+        return self._cells[:], [set(markers) for markers in self._markers], [set(numbers) for numbers in self._unit_sets], self._empty_cells
+
+    def restore(self, state):
+        cells, markers, unit_sets, self._empty_cells = state
+        self._cells = cells[:]
+        self._markers = [set(cell_markers) for cell_markers in markers]
+        self._unit_sets = [set(numbers) for numbers in unit_sets]
+
+    def get_size(self):
+        return 9
+
+    def get_value(self, row, col):
+        return self._cells[row*9+col] or 0
+
+    def find_peers_with(self, row, col, digit):
+        return [(peer // 9,peer % 9) for peer in self._layout.peers[row*9+col] if self._cells[peer] == digit]
+
+    def place(self, row, col, digit):
+        self._cells[row*9+col] = digit
+        self._markers[row*9+col] = set()
+        self._empty_cells -= 1
+        for peer in self._layout.peers[row*9+col]:
+            self._markers[peer].discard(digit)
+
+    #the empty cell with the fewest markers and its markers
+    def choose_branch_cell(self):
+        best = None
+        for index in range(81):
+            if self._cells[index] != "":
+                continue
+            if best is None or len(self._markers[index]) < len(self._markers[best]):
+                best = index
+        return best // 9, best % 9, sorted(self._markers[best])
+
+    def has_contradiction(self):
+        for index in range(81):
+            if self._cells[index] == "" and len(self._markers[index]) == 0:
+                return True
+        #a number that is neither placed nor a marker anywhere in a unit
+        for unit in self._layout.units:
+            numbers = set()
+            for cell in unit:
+                if self._cells[cell] != "":
+                    numbers.add(self._cells[cell])
+                else:
+                    numbers |= self._markers[cell]
+            if len(numbers) != 9:
+                return True
+        return False
+
+    def _fill_initially_markers(self):
+        for index in range(81):
+            if self._cells[index] != "":
+                continue
+            self._markers[index] = {*SudokuSolver.ALL_NUMBERS}
+
+    #fills the cells which have a single marker
+    def _populate_field(self):
+        for index in range(81):
+            if self._cells[index] != "":
+                continue
+            if len(self._markers[index]) == 1:
+                self.place(index // 9,index % 9,self._markers[index].pop())
+                if self._single:
+                    return
+
+    #finds the only cell, which can contain a certain number
+    def _find_only_markers(self):
+        for units in (self._layout.squares,self._layout.rows,self._layout.cols):
+            for unit in units:
+                if self._find_only_markers_in_unit(unit):
+                    return
+
+    def _find_only_markers_in_unit(self,unit):
+        for cell in unit:
+            if self._cells[cell] != "":
+                continue
+            if self._stops(self._check_cell_for_only_marker_in_unit,unit,cell):
+                return True
+        return False
+
+    def _check_cell_for_only_marker_in_unit(self,unit,cell):
+        cell_markers = {*self._markers[cell]}
+
+        for other in unit:
+            if other == cell or self._cells[other] != "":
+                continue
+            cell_markers = cell_markers.difference(self._markers[other])
+
+        if len(cell_markers) == 1:
+            self.place(cell // 9,cell % 9,cell_markers.pop())
+            return
+
+        for other in unit:
+            if other == cell or self._cells[other] != "":
+                continue
+            self._markers[other] = self._markers[other].difference(cell_markers)
+
+    #finds combinations (pairs, triplets, etc.)
+    def _find_combinations(self):
+        for units in (self._layout.squares,self._layout.cols,self._layout.rows):
+            for unit in units:
+                for occurrences_amount in range(2,9,1):
+                    if self._find_combinations_by_occurrences_in_unit(occurrences_amount,unit):
+                        return
+
+    def _find_combinations_by_occurrences_in_unit(self,occurrences,unit):
+        cells_open = [cell for cell in unit if self._cells[cell] == ""]
+        possible_combinations = list(itertools.combinations(cells_open,occurrences))
+
+        for combination in possible_combinations:
+            combination_markers = set()
+            for cell in combination:
+                combination_markers = combination_markers.union(self._markers[cell])
+            for cell in cells_open:
+                if cell in combination:
+                    continue
+                combination_markers = combination_markers - self._markers[cell]
+            if len(combination_markers) == occurrences:
+                if self._stops(self._apply_combination,cells_open,combination,combination_markers):
+                    return True
+        return False
+
+    def _apply_combination(self,cells_open,combination,combination_markers):
+        for cell in cells_open:
+            if cell in combination:
+                self._markers[cell] = self._markers[cell].intersection(combination_markers)
+            else:
+                self._markers[cell] = self._markers[cell].difference(combination_markers)
+
+    #searches and fills pointing combinations
+    def _fill_pointers(self):
+        for intersections in self._layout.square_intersections:
+            for n in range(3):
+                if self._stops(self._fill_line_pointers,*intersections[n]) or self._stops(self._fill_line_pointers,*intersections[3+n]):
+                    return True
+        return False
+
+    def _fill_line_pointers(self,segment,rest_of_square,rest_of_line):
+        line_markers = set()
+
+        for cell in segment:
+            if self._cells[cell] != "":
+                continue
+            line_markers = line_markers.union(self._markers[cell])
+
+        for cell in rest_of_square:
+            line_markers -= self._markers[cell]
+
+        if len(line_markers) == 0:
+            return
+
+        for cell in rest_of_line:
+            self._markers[cell] -= line_markers
+
+    #pointing from the squares into the lines and claiming from the lines into the squares
+    def _fill_intersections(self):
+        if not self._fill_pointers():
+            self._fill_claims()
+
+    #searches and fills claiming combinations, the pointers of a line into a square
+    def _fill_claims(self):
+        for intersections in self._layout.square_intersections:
+            for n in range(6):
+                if self._stops(self._fill_square_claims,*intersections[n]):
+                    return
+
+    def _fill_square_claims(self,segment,rest_of_square,rest_of_line):
+        line_markers = set()
+
+        for cell in segment:
+            if self._cells[cell] != "":
+                continue
+            line_markers = line_markers.union(self._markers[cell])
+
+        for cell in rest_of_line:
+            line_markers -= self._markers[cell]
+
+        if len(line_markers) == 0:
+            return
+
+        for cell in rest_of_square:
+            self._markers[cell] -= line_markers
+
+    #excludes impossible markers from every cell
+    def _fill_markers_from_sets(self):
+        for index in range(81):
+            if self._cells[index] != "":
+                continue
+            self._markers[index] = self._markers[index].difference(set.union(*(self._unit_sets[unit] for unit in self._layout.cell_units[index])))
+
+    #adds newly found numbers to the sets
+    def _fill_sets(self):
+        for index in range(81):
+            if self._cells[index] == "":
+                continue
+            for unit in self._layout.cell_units[index]:
+                self._unit_sets[unit].add(self._cells[index])
+
+
+#the geometry of a board made of squares of square_height x square_width cells, as flat cell indices
+#rows are units 0 to size-1, then come the cols and the squares; square_intersections holds, for every square,
+#(cells in both, rest of the square, rest of the line) for each of its rows and then each of its cols
+Layout = collections.namedtuple("Layout",["square_height","square_width","size","cells","all_mask","bits","typecode",
+                                          "popcount","lowest_digit","rows","cols","squares","units","cell_units",
+                                          "peers","square_intersections"])
+
+def _build_layout(square_height, square_width):
+    size = square_height*square_width
+    if size <= 16:
+        popcount = tuple(bin(mask).count("1") for mask in range(1 << size))
+        lowest_digit = tuple((mask & -mask).bit_length() for mask in range(1 << size))
+    else:
+        popcount = _Popcount()
+        lowest_digit = _LowestDigit()
+
+    rows = tuple(tuple(row*size+col for col in range(size)) for row in range(size))
+    cols = tuple(tuple(row*size+col for row in range(size)) for col in range(size))
+    squares = tuple(tuple((square_row*square_height+row_add)*size+square_col*square_width+col_add
+                          for row_add in range(square_height) for col_add in range(square_width))
+                    for square_row in range(square_width) for square_col in range(square_height))
+    units = rows+cols+squares
+    cell_units = tuple((index//size,size+index%size,2*size+index//size//square_height*square_height+index%size//square_width)
+                       for index in range(size*size))
+    peers = tuple(tuple(sorted({cell for unit in cell_units[index] for cell in units[unit]}-{index}))
+                  for index in range(size*size))
+
+    square_intersections = []
+    for square in squares:
+        lines = [rows[square[0]//size+n] for n in range(square_height)]+[cols[square[0]%size+n] for n in range(square_width)]
+        intersections = []
+        for line in lines:
+            segment = tuple(cell for cell in square if cell in line)
+            intersections.append((segment,tuple(cell for cell in square if cell not in segment),
+                                  tuple(cell for cell in line if cell not in segment)))
+        square_intersections.append(tuple(intersections))
+
+    return Layout(square_height,square_width,size,size*size,(1 << size)-1,tuple(1 << n for n in range(size)),
+                  "H" if size <= 16 else "Q",popcount,lowest_digit,rows,cols,squares,units,cell_units,peers,
+                  tuple(square_intersections))
+
+
+def _row_cell(row, col, size):
+    return row*size+col
+
+def _col_cell(col, row, size):
+    return row*size+col
+
+
+#bit counting for masks too wide for lookup tables
+class _Popcount:
+
+    def __getitem__(self, mask):
+        return bin(mask).count("1")
+
+class _LowestDigit:
+
+    def __getitem__(self, mask):
+        return (mask & -mask).bit_length()
+
+
+_LAYOUTS = {}
+
+#built on first use and shared by every solver of that size for the rest of the process
+def get_layout(square_height, square_width):
+    key = (square_height,square_width)
+    if key not in _LAYOUTS:
+        _LAYOUTS[key] = _build_layout(square_height,square_width)
+    return _LAYOUTS[key]
+
+#squares as close to square as possible, e.g. 3x3 for 9, 2x3 for 6 and 3x4 for 12
+def get_default_square_size(size):
+    square_height = max(n for n in range(1,int(size**0.5)+1) if size % n == 0)
+    return square_height, size // square_height
+
+
+#candidates kept as masks (bit n-1 set means n is possible) in one flat array of cells
+#placing a number removes it from the peers right away, and every change stamps the units of its cell,
+#so each technique only looks at the units changed since it last ran
+#the masks, the numbers, the stamps of the units and the clocks seen by the techniques are views of one buffer,
+#so a snapshot is a copy of it and restoring writes it back in place
+class _BitmaskEngine:
+
+    __slots__ = ("_layout","_state","_masks","_values","_unit_stamps","_seen_clocks","_empty_cells","_clock","_contradiction",
+                 "_single")
+
+    POINTERS, COMBINATIONS, ONLY_MARKERS, POPULATE, X_WING, SWORDFISH, JELLYFISH, XY_WING, XYZ_WING, COLORING = range(10)
+    TECHNIQUE_COUNT = 10
+    #bigger naked/hidden combinations are left to the search, their number grows too fast on big boards
+    MAX_COMBINATION_SIZE = 4
+
+    #values are a flat sequence of numbers, 0 for an empty cell
+    #every change removes a marker or fills a cell and restoring turns the clock back too, so the clock stays below
+    #cells*(size+1) and fits the typecode of the masks
+    def __init__(self, values, layout):
+        self._layout = layout
+        cells = layout.cells
+        units = len(layout.units)
+        self._state = array(layout.typecode,bytes(array(layout.typecode).itemsize*(2*cells+units+_BitmaskEngine.TECHNIQUE_COUNT)))
+        self._state[cells:2*cells] = array(layout.typecode,values)
+        view = memoryview(self._state)
+        self._masks = view[:cells]
+        self._values = view[cells:2*cells]
+        self._unit_stamps = view[2*cells:2*cells+units]
+        self._seen_clocks = view[2*cells+units:]
+        self._empty_cells = values.count(0)
+        self._clock = 0
+        self._contradiction = False
+        self._single = False
+
+    def prepare(self):
+        layout = self._layout
+        values = self._values
+        masks = self._masks
+        for index in range(layout.cells):
+            if values[index] == 0:
+                masks[index] = layout.all_mask
+        for index in range(layout.cells):
+            if values[index] != 0:
+                without_value = ~(1 << (values[index]-1))
+                for peer in layout.peers[index]:
+                    masks[peer] &= without_value
+        self._contradiction = any(values[index] == 0 and masks[index] == 0 for index in range(layout.cells))
+        #every unit starts out changed for every technique
+        self._clock = 1
+        for unit in range(len(layout.units)):
+            self._unit_stamps[unit] = 1
+        for technique in range(_BitmaskEngine.TECHNIQUE_COUNT):
+            self._seen_clocks[technique] = 0
+
+    def get_techniques(self):
+        return {"naked_singles":self._populate_field,"hidden_singles":self._find_only_markers,
+                "pointers":self._fill_pointers,"subsets":self._find_combinations,
+                "x_wing":self._find_x_wings,"xy_wing":self._find_xy_wings,"xyz_wing":self._find_xyz_wings,
+                "swordfish":self._find_swordfish,"simple_coloring":self._find_colorings,"jellyfish":self._find_jellyfish}
+
+    def count_markers(self):
+        popcount = self._layout.popcount
+        return sum(popcount[mask] for mask in self._masks)
+
+    def count_empty_cells(self):
+        return self._empty_cells
+
+    def is_solved(self):
+        return self._empty_cells == 0
+
+    #changes whenever a cell or a marker changes
+    def version(self):
+        return self._clock
+
+    def get_field(self):
+        size = self._layout.size
+        return [[value or "" for value in self._values[row*size:row*size+size]] for row in range(size)]
+
+    def get_markers(self):
+        size = self._layout.size
+        return [[{digit for digit in range(1,size+1) if self._masks[row*size+col] & (1 << (digit-1))} for col in range(size)]
+                for row in range(size)]
+
+    def snapshot(self):
+        return self._state[:], self._empty_cells, self._clock, self._contradiction
+
+    def restore(self, state):
+        buffer, self._empty_cells, self._clock, self._contradiction = state
+        self._state[:] = buffer
+
+    def get_size(self):
+        return self._layout.size
+
+    def get_value(self, row, col):
+        return self._values[row*self._layout.size+col]
+
+    #the (row, col) of the peers holding the number
+    def find_peers_with(self, row, col, digit):
+        size = self._layout.size
+        return [(peer // size,peer % size) for peer in self._layout.peers[row*size+col] if self._values[peer] == digit]
+
+    def place(self, row, col, digit):
+        self._place(row*self._layout.size+col,digit)
+
+    #the empty cell with the fewest markers and its markers
+    def choose_branch_cell(self):
+        popcount = self._layout.popcount
+        size = self._layout.size
+        best = None
+        for index in range(self._layout.cells):
+            if self._values[index] != 0:
+                continue
+            if best is None or popcount[self._masks[index]] < popcount[self._masks[best]]:
+                best = index
+        mask = self._masks[best]
+        return best // size, best % size, [digit for digit in range(1,size+1) if mask & (1 << (digit-1))]
+
+    #the clues are checked by the solver, after that a number only goes where it is a marker, so a contradiction
+    #always shows up as an empty cell without markers, or as a number without a place noticed by the hidden singles
+    def has_contradiction(self):
+        return self._contradiction
+
+    def _place(self, index, digit):
+        masks = self._masks
+        self._values[index] = digit
+        masks[index] = 0
+        self._empty_cells -= 1
+        self._touch(index)
+        bit = 1 << (digit-1)
+        for peer in self._layout.peers[index]:
+            if masks[peer] & bit:
+                masks[peer] ^= bit
+                self._touch(peer)
+                if masks[peer] == 0:
+                    self._contradiction = True
+
+    def _set_mask(self, index, mask):
+        self._masks[index] = mask
+        self._touch(index)
+        if mask == 0:
+            self._contradiction = True
+
+    def _touch(self, index):
+        self._clock += 1
+        for unit in self._layout.cell_units[index]:
+            self._unit_stamps[unit] = self._clock
+
+    #in single step mode a technique stops after its first deduction
+    def set_single_step(self, single):
+        self._single = single
+
+    #a technique stopping early in single step mode looks at every unit again the next time,
+    #as it didn't get to all the ones it was given
+    def _stop_early(self, technique):
+        self._seen_clocks[technique] = 0
+
+    #units changed since the technique last asked, the technique is then up to date
+    def _take_dirty_units(self, technique):
+        seen = self._seen_clocks[technique]
+        self._seen_clocks[technique] = self._clock
+        return [unit for unit, stamp in enumerate(self._unit_stamps) if stamp > seen]
+
+    #fills the cells which have a single marker
+    def _populate_field(self):
+        layout = self._layout
+        values = self._values
+        masks = self._masks
+        for unit in self._take_dirty_units(_BitmaskEngine.POPULATE):
+            for cell in layout.units[unit]:
+                if values[cell] == 0 and layout.popcount[masks[cell]] == 1:
+                    self._place(cell,layout.lowest_digit[masks[cell]])
+                    if self._single:
+                        self._stop_early(_BitmaskEngine.POPULATE)
+                        return
+
+    #finds the only cell, which can contain a certain number
+    def _find_only_markers(self):
+        masks = self._masks
+        values = self._values
+        all_mask = self._layout.all_mask
+        popcount = self._layout.popcount
+        lowest_digit = self._layout.lowest_digit
+        for unit in self._take_dirty_units(_BitmaskEngine.ONLY_MARKERS):
+            cells = self._layout.units[unit]
+            once = 0
+            twice = 0
+            placed = 0
+            for cell in cells:
+                twice |= once & masks[cell]
+                once |= masks[cell]
+                if values[cell]:
+                    placed |= 1 << (values[cell]-1)
+            if once | placed != all_mask:
+                self._contradiction = True
+                return
+            only = once & ~twice
+            if only == 0:
+                continue
+            #a cell with one of the numbers gets it right away, so the placement counts for this rule;
+            #one with more of them is left with those and turns out to be a contradiction
+            for cell in cells:
+                mask = masks[cell]
+                if mask & only and mask & ~only:
+                    if popcount[mask & only] == 1:
+                        self._place(cell,lowest_digit[mask & only])
+                    else:
+                        self._set_mask(cell,mask & only)
+                    if self._single:
+                        self._stop_early(_BitmaskEngine.ONLY_MARKERS)
+                        return
+
+    #finds naked and hidden combinations (pairs, triplets, etc.)
+    #n open cells with n markers between them leave a hidden combination of the other numbers in the other cells,
+    #so looking for both kinds up to half of the open cells covers every size
+    def _find_combinations(self):
+        for unit in self._take_dirty_units(_BitmaskEngine.COMBINATIONS):
+            if self._find_combinations_in_unit(self._layout.units[unit]) and self._single:
+                self._stop_early(_BitmaskEngine.COMBINATIONS)
+                return
+
+    #stops at the first combination that changes the unit, which leaves it dirty for the next round; tells whether
+    #the unit changed
+    def _find_combinations_in_unit(self,unit):
+        popcount = self._layout.popcount
+        masks = self._masks
+        cells_open = [cell for cell in unit if self._values[cell] == 0]
+        max_occurrences = min(len(cells_open) // 2,_BitmaskEngine.MAX_COMBINATION_SIZE)
+        if max_occurrences < 2:
+            return
+        cell_markers = [masks[cell] for cell in cells_open]
+        number_bits = []
+        number_positions = []
+        for bit in self._layout.bits:
+            positions = 0
+            for position in range(len(cells_open)):
+                if cell_markers[position] & bit:
+                    positions |= 1 << position
+            if positions:
+                number_bits.append(bit)
+                number_positions.append(positions)
+        cell_counts = [popcount[mask] for mask in cell_markers]
+        number_counts = [popcount[positions] for positions in number_positions]
+
+        for occurrences in range(2,max_occurrences+1):
+            for combination, combination_markers in _BitmaskEngine._iter_combinations(cell_markers,cell_counts,occurrences,popcount):
+                changed = False
+                for position in range(len(cells_open)):
+                    if combination & (1 << position):
+                        continue
+                    mask = cell_markers[position]
+                    if mask & combination_markers:
+                        self._set_mask(cells_open[position],mask & ~combination_markers)
+                        changed = True
+                if changed:
+                    return True
+            for combination, combination_positions in _BitmaskEngine._iter_combinations(number_positions,number_counts,occurrences,popcount):
+                numbers = 0
+                for index in range(len(number_bits)):
+                    if combination & (1 << index):
+                        numbers |= number_bits[index]
+                changed = False
+                for position in range(len(cells_open)):
+                    if not combination_positions & (1 << position):
+                        continue
+                    mask = cell_markers[position]
+                    if mask & ~numbers:
+                        self._set_mask(cells_open[position],mask & numbers)
+                        changed = True
+                if changed:
+                    return True
+        return False
+
+    #yields (chosen items as a bitset, union of their masks) for every choice of `size` items whose union has `size` bits
+    #choices are extended one item at a time and dropped as soon as the union grows too big
+    @staticmethod
+    def _iter_combinations(item_masks,item_counts,size,popcount):
+        items = [(index,item_masks[index]) for index in range(len(item_masks)) if item_counts[index] <= size]
+        return _BitmaskEngine._extend_combinations(items,size,popcount,0,0,0,0)
+
+    @staticmethod
+    def _extend_combinations(items,size,popcount,start,chosen,chosen_amount,union):
+        for item in range(start,len(items)):
+            index, mask = items[item]
+            new_union = union | mask
+            if popcount[new_union] > size:
+                continue
+            if chosen_amount+1 == size:
+                if popcount[new_union] == size:
+                    yield chosen | (1 << index), new_union
+            else:
+                yield from _BitmaskEngine._extend_combinations(items,size,popcount,item+1,chosen | (1 << index),chosen_amount+1,new_union)
+
+    #intersection removal in both directions: a number of a square only possible where it meets a line leaves the rest
+    #of the line (pointing), a number of a line only possible where it meets a square leaves the rest of the square
+    #(claiming); every cell is read once per direction into the markers of the row and col segments, and all
+    #removals are deduced from those before any is applied
+    def _fill_pointers(self):
+        if not self._take_dirty_units(_BitmaskEngine.POINTERS):
+            return
+        layout = self._layout
+        masks = self._masks
+        size = layout.size
+        square_height = layout.square_height
+        square_width = layout.square_width
+        #row_segments[row][stack] are the markers of the row in the stack-th square across, col_segments[col][band]
+        #those of the col in the band-th square down
+        row_segments = [[0]*square_height for row in range(size)]
+        col_segments = [[0]*square_width for col in range(size)]
+        for index in range(layout.cells):
+            mask = masks[index]
+            if mask:
+                row = index // size
+                col = index % size
+                row_segments[row][col // square_width] |= mask
+                col_segments[col][row // square_height] |= mask
+        for segments, lines_per_square, squares_per_line, to_cell in ((row_segments,square_height,square_height,_row_cell),
+                                                                      (col_segments,square_width,square_width,_col_cell)):
+            removals = []
+            #claiming: the numbers of a line in a single one of its segments
+            for line in range(size):
+                line_segments = segments[line]
+                once = 0
+                twice = 0
+                for segment in line_segments:
+                    twice |= once & segment
+                    once |= segment
+                only = once & ~twice
+                if only == 0:
+                    continue
+                first_line = line-line % lines_per_square
+                for square in range(squares_per_line):
+                    claimed = line_segments[square] & only
+                    if claimed == 0:
+                        continue
+                    for other in range(first_line,first_line+lines_per_square):
+                        if other != line and segments[other][square] & claimed:
+                            removals.append((other,square,claimed))
+            #pointing: the numbers of a square in a single one of its segments
+            for first_line in range(0,size,lines_per_square):
+                for square in range(squares_per_line):
+                    once = 0
+                    twice = 0
+                    for line in range(first_line,first_line+lines_per_square):
+                        twice |= once & segments[line][square]
+                        once |= segments[line][square]
+                    only = once & ~twice
+                    if only == 0:
+                        continue
+                    for line in range(first_line,first_line+lines_per_square):
+                        pointing = segments[line][square] & only
+                        if pointing == 0:
+                            continue
+                        for other in range(squares_per_line):
+                            if other != square and segments[line][other] & pointing:
+                                removals.append((line,other,pointing))
+            segment_length = size // squares_per_line
+            for line, square, markers in removals:
+                changed = False
+                for position in range(square*segment_length,square*segment_length+segment_length):
+                    cell = to_cell(line,position,size)
+                    if masks[cell] & markers:
+                        self._set_mask(cell,masks[cell] & ~markers)
+                        changed = True
+                if changed and self._single:
+                    self._stop_early(_BitmaskEngine.POINTERS)
+                    return
+
+    def _find_x_wings(self):
+        self._find_fish(_BitmaskEngine.X_WING,2)
+
+    def _find_swordfish(self):
+        self._find_fish(_BitmaskEngine.SWORDFISH,3)
+
+    def _find_jellyfish(self):
+        self._find_fish(_BitmaskEngine.JELLYFISH,4)
+
+    #fish: when a number is only possible in the same n cols of n rows, it goes into those cols in those rows,
+    #so it leaves the rest of the cols; the same with rows and cols swapped
+    def _find_fish(self, technique, size):
+        if not self._take_dirty_units(technique):
+            return
+        layout = self._layout
+        masks = self._masks
+        popcount = layout.popcount
+        row_positions, col_positions = self._number_positions()
+        for digit in range(layout.size):
+            bit = 1 << digit
+            for positions, crossing_lines in ((row_positions[digit],layout.cols),(col_positions[digit],layout.rows)):
+                bases = [line for line in range(layout.size) if 2 <= popcount[positions[line]] <= size]
+                if len(bases) < size:
+                    continue
+                base_positions = [positions[line] for line in bases]
+                counts = [popcount[line_positions] for line_positions in base_positions]
+                for chosen, covered in _BitmaskEngine._iter_combinations(base_positions,counts,size,popcount):
+                    fish = {bases[index] for index in range(len(bases)) if chosen & (1 << index)}
+                    changed = False
+                    for crossing in range(layout.size):
+                        if not covered & (1 << crossing):
+                            continue
+                        for line, cell in enumerate(crossing_lines[crossing]):
+                            if line not in fish and masks[cell] & bit:
+                                self._set_mask(cell,masks[cell] & ~bit)
+                                changed = True
+                    if changed:
+                        return
+
+    #for every number, where it is possible in every row as a mask of cols and in every col as a mask of rows
+    def _number_positions(self):
+        layout = self._layout
+        size = layout.size
+        masks = self._masks
+        lowest_digit = layout.lowest_digit
+        row_positions = [[0]*size for digit in range(size)]
+        col_positions = [[0]*size for digit in range(size)]
+        for index in range(layout.cells):
+            mask = masks[index]
+            row = index // size
+            col = index % size
+            while mask:
+                digit = lowest_digit[mask]-1
+                row_positions[digit][row] |= 1 << col
+                col_positions[digit][col] |= 1 << row
+                mask &= mask-1
+        return row_positions, col_positions
+
+    #xy-wing: a cell with markers ab sees a cell with ac and one with bc, one of those two holds c,
+    #so c leaves the cells seeing both
+    def _find_xy_wings(self):
+        if not self._take_dirty_units(_BitmaskEngine.XY_WING):
+            return
+        layout = self._layout
+        masks = self._masks
+        popcount = layout.popcount
+        for pivot in range(layout.cells):
+            pivot_mask = masks[pivot]
+            if popcount[pivot_mask] != 2:
+                continue
+            wings = [peer for peer in layout.peers[pivot] if popcount[masks[peer]] == 2 and popcount[masks[peer] & pivot_mask] == 1]
+            for first, second in itertools.combinations(wings,2):
+                shared = masks[first] & masks[second]
+                if popcount[shared] != 1 or shared & pivot_mask or (masks[first] | masks[second]) & pivot_mask != pivot_mask:
+                    continue
+                if self._eliminate_seen_by((first,second),shared):
+                    return
+
+    #xyz-wing: a cell with markers abc sees a cell with ac and one with bc, one of the three holds c,
+    #so c leaves the cells seeing all three
+    def _find_xyz_wings(self):
+        if not self._take_dirty_units(_BitmaskEngine.XYZ_WING):
+            return
+        layout = self._layout
+        masks = self._masks
+        popcount = layout.popcount
+        for pivot in range(layout.cells):
+            pivot_mask = masks[pivot]
+            if popcount[pivot_mask] != 3:
+                continue
+            wings = [peer for peer in layout.peers[pivot] if popcount[masks[peer]] == 2 and masks[peer] & ~pivot_mask == 0]
+            for first, second in itertools.combinations(wings,2):
+                shared = masks[first] & masks[second]
+                if popcount[shared] != 1 or masks[first] | masks[second] != pivot_mask:
+                    continue
+                if self._eliminate_seen_by((pivot,first,second),shared):
+                    return
+
+    #removes the markers from every cell seeing all the given cells, tells whether any was removed
+    def _eliminate_seen_by(self, cells, markers):
+        masks = self._masks
+        seeing = set(self._layout.peers[cells[0]])
+        for cell in cells[1:]:
+            seeing.intersection_update(self._layout.peers[cell])
+        changed = False
+        for cell in seeing:
+            if masks[cell] & markers:
+                self._set_mask(cell,masks[cell] & ~markers)
+                changed = True
+        return changed
+
+    #simple coloring: the cells of a number linked by units where it has only two places alternate between holding it
+    #and not; a color twice in a unit can't hold it, and a cell seeing both colors can't either
+    def _find_colorings(self):
+        if not self._take_dirty_units(_BitmaskEngine.COLORING):
+            return
+        layout = self._layout
+        masks = self._masks
+        lowest_digit = layout.lowest_digit
+        #the cells of every unit where every number is possible
+        places = [[[] for unit in layout.units] for digit in range(layout.size)]
+        for index in range(layout.cells):
+            mask = masks[index]
+            while mask:
+                digit_places = places[lowest_digit[mask]-1]
+                for unit in layout.cell_units[index]:
+                    digit_places[unit].append(index)
+                mask &= mask-1
+        for digit in range(layout.size):
+            bit = 1 << digit
+            links = {}
+            for unit_places in places[digit]:
+                if len(unit_places) == 2:
+                    links.setdefault(unit_places[0],[]).append(unit_places[1])
+                    links.setdefault(unit_places[1],[]).append(unit_places[0])
+            colors = {}
+            for start in links:
+                if start in colors:
+                    continue
+                colors[start] = 0
+                chain = [start]
+                for cell in chain:
+                    for linked in links[cell]:
+                        if linked not in colors:
+                            colors[linked] = 1-colors[cell]
+                            chain.append(linked)
+                if len(chain) > 2 and self._eliminate_colors(bit,chain,colors):
+                    return
+
+    def _eliminate_colors(self, bit, chain, colors):
+        layout = self._layout
+        masks = self._masks
+        for color in (0,1):
+            cells = [cell for cell in chain if colors[cell] == color]
+            for first, second in itertools.combinations(cells,2):
+                if second in layout.peers[first]:
+                    for cell in cells:
+                        self._set_mask(cell,masks[cell] & ~bit)
+                    return True
+        seen_by = [set(),set()]
+        for cell in chain:
+            seen_by[colors[cell]].update(layout.peers[cell])
+        changed = False
+        for cell in seen_by[0] & seen_by[1]:
+            if cell not in colors and masks[cell] & bit:
+                self._set_mask(cell,masks[cell] & ~bit)
+                changed = True
+        return changed
@@ -0,0 +1,154 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .solver import SudokuSolver, SolveResult, get_layout, get_default_square_size
+
+#puzzles propagated together, bounds the memory of the temporary (block, cells, peers) arrays
+BLOCK_SIZE = 4096
+
+
+#solves an (N, cells) array of numbers, 0 for an empty cell, all puzzles of a block at once
+#peer elimination, hidden singles, pointers in both directions and naked singles run on an (N, cells) uint16 mask array
+#in lockstep; puzzles the rules can't finish are handed to SudokuSolver, starting from the deductions made
+#returns the (N, cells) array of solutions (the grid reached when unsolved) and the status of every puzzle
+def solve_array(puzzles, square_height = None, square_width = None, block_size = BLOCK_SIZE):
+    if numpy is None:
+        raise ImportError("solve_array needs numpy, install it with pip install numpy")
+    puzzles = numpy.asarray(puzzles)
+    if puzzles.ndim != 2:
+        raise ValueError("Expected an (N, cells) array, got shape {}".format(puzzles.shape))
+    size = int(puzzles.shape[1]**0.5)
+    if size*size != puzzles.shape[1] or size == 0:
+        raise ValueError("Expected a square number of cells, got {}".format(puzzles.shape[1]))
+    if size > 16:
+        raise ValueError("solve_array supports boards up to 16x16, got {}x{}".format(size,size))
+    if square_height is None or square_width is None:
+        square_height, square_width = get_default_square_size(size)
+    if square_height*square_width != size:
+        raise ValueError("Squares of {}x{} don't fit a board of {} rows".format(square_height,square_width,size))
+    if puzzles.size and (puzzles.min() < 0 or puzzles.max() > size):
+        raise ValueError("Expected numbers from 0 to {}".format(size))
+    tables = _get_tables(square_height,square_width)
+    grids = puzzles.astype(numpy.uint8)
+    statuses = []
+    for start in range(0,len(grids),block_size):
+        block = grids[start:start+block_size]
+        block_statuses = _propagate(block,tables)
+        for offset in numpy.flatnonzero(block_statuses == _STALLED):
+            grid, block_statuses[offset] = _solve_stalled(block[offset],tables)
+            block[offset] = grid
+        statuses.extend(_STATUSES[status] for status in block_statuses)
+    return grids, statuses
+
+
+_RUNNING, _SOLVED, _STALLED, _CONTRADICTION = range(4)
+_STATUSES = {_SOLVED:SolveResult.SOLVED,_STALLED:SolveResult.STALLED,_CONTRADICTION:SolveResult.CONTRADICTION}
+
+#index arrays built from the Layout shared with SudokuSolver
+class _Tables:
+
+    def __init__(self, layout):
+        size = layout.size
+        self.layout = layout
+        self.all_mask = numpy.uint16(layout.all_mask)
+        self.bits = numpy.array((0,)+layout.bits,dtype=numpy.uint16)
+        self.popcount = numpy.array(layout.popcount,dtype=numpy.uint8)
+        self.lowest_digit = numpy.array(layout.lowest_digit,dtype=numpy.uint8)
+        self.peers = numpy.array(layout.peers,dtype=numpy.intp)
+        self.units = numpy.array(layout.units,dtype=numpy.intp)
+        #where every cell sits in the flattened (units, size) array, for each of its three units
+        self.unit_positions = numpy.array([[unit*size+layout.units[unit].index(index) for unit in layout.cell_units[index]]
+                                           for index in range(layout.cells)],dtype=numpy.intp)
+        #the intersections of the squares with their rows and with their cols have the same shape each,
+        #for every cell the intersections whose rest of the line holds it and those whose rest of the square holds it
+        self.pointers = []
+        for first, last in ((0,layout.square_height),(layout.square_height,layout.square_height+layout.square_width)):
+            intersections = [intersection for square in layout.square_intersections for intersection in square[first:last]]
+            line_covering = [[] for index in range(layout.cells)]
+            square_covering = [[] for index in range(layout.cells)]
+            for number, (segment, rest_of_square, rest_of_line) in enumerate(intersections):
+                for cell in rest_of_line:
+                    line_covering[cell].append(number)
+                for cell in rest_of_square:
+                    square_covering[cell].append(number)
+            self.pointers.append(tuple(numpy.array(part,dtype=numpy.intp) for part in zip(*intersections))+
+                                 (numpy.array(line_covering,dtype=numpy.intp),numpy.array(square_covering,dtype=numpy.intp)))
+
+
+_TABLES = {}
+
+def _get_tables(square_height, square_width):
+    key = (square_height,square_width)
+    if key not in _TABLES:
+        _TABLES[key] = _Tables(get_layout(square_height,square_width))
+    return _TABLES[key]
+
+#applies the rules to the whole block until every puzzle is solved, contradicted or stalled
+#fills in the numbers found and returns the status of every puzzle
+def _propagate(values, tables):
+    statuses = numpy.full(len(values),_RUNNING,dtype=numpy.uint8)
+    masks = numpy.full(values.shape,tables.all_mask,dtype=numpy.uint16)
+    active = numpy.arange(len(values))
+    while len(active):
+        current_values = values[active]
+        current_masks = masks[active]
+        new_masks = _apply_rules(current_values,current_masks,tables)
+        contradicted = _find_contradictions(current_values,new_masks,tables)
+        open_cells = current_values == 0
+        singles = open_cells & (tables.popcount[new_masks] == 1)
+        new_values = numpy.where(singles,tables.lowest_digit[new_masks],current_values)
+        changed = (new_values != current_values).any(axis=1) | (new_masks != current_masks).any(axis=1)
+        #numbers placed in this round are only checked in the next one
+        solved = ~contradicted & ~open_cells.any(axis=1)
+        statuses[active[contradicted]] = _CONTRADICTION
+        statuses[active[solved]] = _SOLVED
+        statuses[active[~changed & ~solved & ~contradicted]] = _STALLED
+        values[active] = new_values
+        masks[active] = new_masks
+        active = active[statuses[active] == _RUNNING]
+    return statuses
+
+#peer elimination, hidden singles and pointers, all on the masks of the same round
+def _apply_rules(values, masks, tables):
+    placed = tables.bits[values]
+    masks = masks & ~numpy.bitwise_or.reduce(placed[:,tables.peers],axis=2)
+    masks[values != 0] = 0
+
+    #hidden singles: a number possible in a single cell of a unit
+    unit_masks = masks[:,tables.units]
+    once = numpy.zeros(unit_masks.shape[:2],dtype=numpy.uint16)
+    twice = numpy.zeros_like(once)
+    for position in range(unit_masks.shape[2]):
+        twice |= once & unit_masks[:,:,position]
+        once |= unit_masks[:,:,position]
+    hidden = (unit_masks & (once & ~twice)[:,:,None]).reshape(len(masks),-1)[:,tables.unit_positions]
+    masks &= numpy.bitwise_and.reduce(numpy.where(hidden != 0,hidden,tables.all_mask),axis=2)
+
+    #pointers: numbers of a square only possible where it meets a line leave the rest of that line,
+    #and numbers of a line only possible where it meets a square leave the rest of that square
+    for segments, rests_of_square, rests_of_line, line_covering, square_covering in tables.pointers:
+        segment_masks = numpy.bitwise_or.reduce(masks[:,segments],axis=2)
+        pointing = segment_masks & ~numpy.bitwise_or.reduce(masks[:,rests_of_square],axis=2)
+        claimed = segment_masks & ~numpy.bitwise_or.reduce(masks[:,rests_of_line],axis=2)
+        masks &= ~(numpy.bitwise_or.reduce(pointing[:,line_covering],axis=2) |
+                   numpy.bitwise_or.reduce(claimed[:,square_covering],axis=2))
+    return masks
+
+#an empty cell without candidates, a number twice in a unit or a number with no place left in a unit
+def _find_contradictions(values, masks, tables):
+    contradicted = ((values == 0) & (masks == 0)).any(axis=1)
+    unit_placed = tables.bits[values][:,tables.units]
+    placed_union = numpy.bitwise_or.reduce(unit_placed,axis=2)
+    contradicted |= (unit_placed.sum(axis=2,dtype=numpy.uint32) != placed_union).any(axis=1)
+    possible = placed_union | numpy.bitwise_or.reduce(masks[:,tables.units],axis=2)
+    contradicted |= (possible != tables.all_mask).any(axis=1)
+    return contradicted
+
+def _solve_stalled(values, tables):
+    layout = tables.layout
+    result = SudokuSolver.from_array(values.tolist(),square_height=layout.square_height,square_width=layout.square_width).solve()
+    grid = numpy.array([cell or 0 for row in result.field for cell in row],dtype=numpy.uint8)
+    status = {SolveResult.SOLVED:_SOLVED,SolveResult.CONTRADICTION:_CONTRADICTION}.get(result.status,_STALLED)
+    return grid, status